@@ -5,12 +5,38 @@ from typing import Literal
 
 
 class Algo:
+    # Whether `calculate` never decreases as a search window widens, which
+    # lets BisectionSearcher bisect instead of sweeping every step.
+    monotone = False
+
     def __init__(
         self,
     ) -> None:
         pass
 
+    def prepare(self, img: np.ndarray):
+        """
+        Precompute whatever `calculate` needs for repeated lookups on `img`.
+        Searchers call this once per transformed glyph and pass the result to
+        every `calculate` call on that glyph.
+        """
+        return img
+
     def calculate(
         self, img: np.ndarray, calculation_area: tuple[int, int, int, int]
     ) -> float:
         raise NotImplementedError()
+
+    def calculate_many(self, img: np.ndarray, calculation_areas) -> np.ndarray:
+        """
+        Score an (N, 4) array of (x1, y1, x2, y2) areas in one call.
+        Algos that can vectorize should override this; the fallback loops
+        over `calculate`.
+        """
+        return np.array(
+            [
+                self.calculate(img, tuple(area))
+                for area in np.asarray(calculation_areas).reshape(-1, 4).tolist()
+            ],
+            dtype=np.float64,
+        )
@@ -0,0 +1,75 @@
+"""
+Raster2BlurGenerator
+Purpose: Converts a 2D pixel array to a gaussian blurred ink coverage field
+Inputs: 2D or RGBA array of pixel values (0-255 or 0.0-1.0), ink dark on a light background
+Outputs: 2D float32 array of blurred ink coverage (0.0 background to 1.0 solid ink)
+"""
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Transform
+from font_fitter_engine.tracing import Tracer
+import numpy as np
+from scipy import ndimage
+
+DEFAULT_BLUR_RADIUS = 16.0
+# Kernel extent in standard deviations, as scipy's gaussian_filter default.
+DEFAULT_TRUNCATE = 4.0
+
+
+class Raster2BlurGenerator(Transform):
+    def __init__(
+        self,
+        blur_radius: float = DEFAULT_BLUR_RADIUS,
+        truncate: float = DEFAULT_TRUNCATE,
+        tracer: Tracer | None = None,
+    ):
+        """
+        blur_radius is the standard deviation of the gaussian in pixels, as
+        the radius of PIL's GaussianBlur. The blur is separable, one 1-D
+        pass per axis, and only the ink bbox grown by the kernel extent is
+        filtered: coverage is zero everywhere else, so the result equals
+        blurring the whole canvas with zeros past its edges.
+        """
+        self.blur_radius = blur_radius
+        self.truncate = truncate
+        return super().__init__(tracer=tracer)
+
+    def generate(self, pixel_array):
+        with self.tracer.span("coverage", category="transform"):
+            coverage = self._coverage(pixel_array)
+        field = np.zeros(coverage.shape, dtype=np.float32)
+        band = self._band(coverage)
+        if band is None:
+            return field
+        with self.tracer.span("blur", category="transform"):
+            field[band] = ndimage.gaussian_filter(
+                coverage[band],
+                sigma=self.blur_radius,
+                mode="constant",
+                cval=0.0,
+                truncate=self.truncate,
+            )
+        return field
+
+    def _coverage(self, pixel_array):
+        """Ink coverage, 1.0 for solid ink; RGB channels are averaged."""
+        if pixel_array.ndim > 2:
+            pixel_array = pixel_array[..., :3].mean(axis=2)
+        scale = 255.0 if pixel_array.max() > 1.0 else 1.0
+        return np.float32(1.0) - pixel_array.astype(np.float32) / np.float32(scale)
+
+    def _band(self, coverage):
+        """
+        Slices of the ink bbox grown by the kernel radius, outside of which
+        the blurred field is exactly zero. None when there is no ink.
+        """
+        ink = coverage > 0
+        rows = np.flatnonzero(ink.any(axis=1))
+        if len(rows) == 0:
+            return None
+        cols = np.flatnonzero(ink.any(axis=0))
+        margin = int(self.truncate * self.blur_radius + 0.5) + 1
+        height, width = ink.shape
+        return (
+            slice(max(0, rows[0] - margin), min(height, rows[-1] + 1 + margin)),
+            slice(max(0, cols[0] - margin), min(width, cols[-1] + 1 + margin)),
+        )
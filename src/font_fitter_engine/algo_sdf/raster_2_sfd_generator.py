@@ -6,6 +6,7 @@ Outputs: 2D array of SDF values (raw distance values in pixels)
 """
 
 from font_fitter_engine.algo import Algo
+from font_fitter_engine.tracing import NULL_TRACER, Tracer
 import numpy as np
 from scipy import ndimage
 from scipy.spatial.distance import cdist
@@ -16,27 +17,84 @@ DEFAULT_OUT_OF_BOUNDS_VALUE = -1.0
 
 
 class Transform:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, tracer: Tracer | None = None) -> None:
+        self.tracer = tracer if tracer is not None else NULL_TRACER
 
     def generate(self, array: np.ndarray):
         raise NotImplementedError
 
+    def cache_key(self) -> tuple:
+        """Identifies the transform config, so cached outputs are only reused
+        by an identically configured transform."""
+        config = {name: value for name, value in vars(self).items() if name != "tracer"}
+        return (type(self).__name__, tuple(sorted(config.items())))
+
 
 class Raster2SDFGenerator(Transform):
-    def __init__(self):
-        return super().__init__()
+    def __init__(self, max_distance: float | None = None, tracer: Tracer | None = None):
+        """
+        max_distance bounds the SDF to [-max_distance, max_distance]. Only the
+        ink bbox grown by max_distance is transformed and the rest of the
+        canvas is filled with max_distance, so the cost scales with the glyph
+        rather than the padded canvas. The result equals the unbounded SDF
+        clipped to that range.
+        """
+        self.max_distance = max_distance
+        return super().__init__(tracer=tracer)
 
     def generate(self, pixel_array):
-        binary_mask = self._create_binary_mask(pixel_array)
-        inside_distances = self._calculate_inside_distances(binary_mask)
-        outside_distances = self._calculate_outside_distances(binary_mask)
-        sdf_array = self._combine_distances(
-            inside_distances, outside_distances, binary_mask
-        )
+        with self.tracer.span("mask", category="transform"):
+            binary_mask = self._create_binary_mask(pixel_array)
+        if self.max_distance is not None:
+            return self._generate_bounded(binary_mask)
+        with self.tracer.span("edt", category="transform"):
+            inside_distances = self._calculate_inside_distances(binary_mask)
+            outside_distances = self._calculate_outside_distances(binary_mask)
+        with self.tracer.span("combine", category="transform"):
+            sdf_array = self._combine_distances(
+                inside_distances, outside_distances, binary_mask
+            )
 
         return sdf_array
 
+    def _generate_bounded(self, binary_mask):
+        sdf_array = np.full(binary_mask.shape, self.max_distance, dtype=np.float32)
+        band = self._band(binary_mask)
+        if band is None:
+            return sdf_array
+
+        band_mask = binary_mask[band]
+        with self.tracer.span("edt", category="transform"):
+            inside_distances = self._calculate_inside_distances(band_mask)
+            outside_distances = self._calculate_outside_distances(band_mask)
+        with self.tracer.span("combine", category="transform"):
+            band_sdf = self._combine_distances(
+                inside_distances, outside_distances, band_mask
+            )
+            np.clip(band_sdf, -self.max_distance, self.max_distance, out=band_sdf)
+            sdf_array[band] = band_sdf
+        return sdf_array
+
+    def _band(self, binary_mask):
+        """
+        Slices of the ink bbox grown by max_distance. Every pixel outside it
+        is at least max_distance from ink, and all ink lies inside it, so
+        distances within the band are exact. None when there is no ink.
+        """
+        ink = ~binary_mask
+        if binary_mask.ndim > 2:
+            ink = ink.any(axis=tuple(range(2, binary_mask.ndim)))
+        rows = np.flatnonzero(ink.any(axis=1))
+        if len(rows) == 0:
+            return None
+        cols = np.flatnonzero(ink.any(axis=0))
+        margin = int(np.ceil(self.max_distance)) + 1
+        height, width = ink.shape
+        return (
+            slice(max(0, rows[0] - margin), min(height, rows[-1] + 1 + margin)),
+            slice(max(0, cols[0] - margin), min(width, cols[-1] + 1 + margin)),
+        )
+
     def _create_binary_mask(self, pixel_array):
         if pixel_array.max() > 1.0:
             threshold = PIXEL_THRESHOLD_8BIT
@@ -5,6 +5,8 @@ Inputs: sdf_array, center_x, height, target_density, step_size, max_width
 Outputs: optimal_area_left, optimal_area_right, left_density_diff, right_density_diff
 """
 
+from font_fitter_engine.algo_sdf.summed_area_table import SummedAreaTable
+
 DEFAULT_STEP_SIZE = 2
 
 
@@ -13,11 +15,13 @@ class SFDTargetSpaceSearcher:
         self.step_size = step_size
 
     def search_optimal_areas(self, sdf_array, center_x, height, target_density):
+        canvas_width = sdf_array.shape[1]
+        sdf_array = SummedAreaTable(sdf_array)
         left_result = self._search_left_side(
             sdf_array, center_x, height, target_density
         )
         right_result = self._search_right_side(
-            sdf_array, center_x, height, target_density
+            sdf_array, center_x, height, canvas_width, target_density
         )
 
         return {
@@ -65,11 +69,13 @@ class SFDTargetSpaceSearcher:
             "step_densities": step_densities,
         }
 
-    def _search_right_side(self, sdf_array, center_x, height, target_density):
+    def _search_right_side(
+        self, sdf_array, center_x, height, canvas_width, target_density
+    ):
         step_densities = []
 
         width = self.step_size
-        while center_x + width < sdf_array.shape[1]:
+        while center_x + width < canvas_width:
             x1 = center_x
             y1 = 0
             x2 = center_x + width
@@ -99,8 +105,5 @@ class SFDTargetSpaceSearcher:
             "step_densities": step_densities,
         }
 
-    # def _calculate_density(self, sdf_array, calculation_area):
-    #     x1, y1, x2, y2 = calculation_area
-    #     zone_sdf = sdf_array[y1:y2, x1:x2]
-    #     area_visual_density = np.sum(zone_sdf)
-    #     return float(area_visual_density)
+    def _calculate_density(self, sdf_array: SummedAreaTable, calculation_area):
+        return sdf_array.sum(calculation_area)
@@ -1,33 +1,59 @@
 """
 SDFVisualDensityCalculator
 Purpose: Calculate the visual density (darkness) of a specific area within an SDF array
-Inputs: calculation_area coordinates (x1, y1, x2, y2) and sdf_array
-Outputs: area_visual_density (single float value)
+Inputs: calculation_area coordinates (x1, y1, x2, y2) and sdf_array (or its SummedAreaTable)
+Outputs: area_visual_density (single float value), or an array of them from calculate_many
 """
 
 import numpy as np
 from font_fitter_engine.algo import Algo
+from font_fitter_engine.algo_sdf.summed_area_table import (
+    SummedAreaTable,
+    as_summed_area_table,
+)
 
 
 class SDFVisualDensityAlgo(Algo):
     def __init__(self):
         pass
 
-    def calculate(self, sdf_array: np.ndarray, calculation_area):
-        x1, y1, x2, y2 = calculation_area
-        zone_sdf = sdf_array[y1:y2, x1:x2]
-        area_visual_density = np.sum(zone_sdf) // (
-            zone_sdf.shape[0] * zone_sdf.shape[1]
+    def prepare(self, sdf_array: np.ndarray) -> SummedAreaTable:
+        return as_summed_area_table(sdf_array)
+
+    def calculate(self, sdf_array: np.ndarray | SummedAreaTable, calculation_area):
+        table = as_summed_area_table(sdf_array)
+        area_visual_density = np.float64(table.sum(calculation_area)) // table.size(
+            calculation_area
         )
         return float(area_visual_density)
 
+    def calculate_many(
+        self, sdf_array: np.ndarray | SummedAreaTable, calculation_areas
+    ) -> np.ndarray:
+        table = as_summed_area_table(sdf_array)
+        return np.floor_divide(
+            table.sum_many(calculation_areas), table.size_many(calculation_areas)
+        )
+
 
 class SDFVisualAreaAlgo(Algo):
+    # A window's sum grows by the columns it gains, and a glyph canvas
+    # column, mostly background, sums to a positive distance.
+    monotone = True
+
     def __init__(self):
         pass
 
-    def calculate(self, sdf_array: np.ndarray, calculation_area):
-        x1, y1, x2, y2 = calculation_area
-        zone_sdf = sdf_array[y1:y2, x1:x2]
-        area_visual_density = np.sum(zone_sdf)
+    def prepare(self, sdf_array: np.ndarray) -> SummedAreaTable:
+        return as_summed_area_table(sdf_array)
+
+    def calculate(self, sdf_array: np.ndarray | SummedAreaTable, calculation_area):
+        table = as_summed_area_table(sdf_array)
+        area_visual_density = table.sum(calculation_area)
         return float(area_visual_density)
+
+    def calculate_many(
+        self, sdf_array: np.ndarray | SummedAreaTable, calculation_areas
+    ) -> np.ndarray:
+        table = as_summed_area_table(sdf_array)
+        return table.sum_many(calculation_areas)
@@ -0,0 +1,218 @@
+import json
+import queue
+import sys
+import threading
+from collections import defaultdict
+from enum import IntEnum
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from font_fitter_engine.results import _to_json
+
+DEFAULT_MAX_QUEUED = 256
+DEFAULT_BATCH_SIZE = 32
+TRACES_FILE = "traces.jsonl"
+
+
+class ArtifactLevel(IntEnum):
+    """How much debug output to write; each level includes the ones below."""
+
+    NONE = 0
+    RASTERS = 1
+    SDF = 2
+    TRACES = 3
+
+
+class ArtifactWriter:
+    """
+    Writes debug artifacts of a run to `out_dir`, up to `level`: glyph
+    rasters (`a.png`), transformed field heatmaps (`a.sdf.png`) and search
+    results with their step traces (appended to traces.jsonl).
+
+    Artifacts go to a subdirectory per font instance, e.g.
+    `Font.ttf/a.png` or `Font.ttf@wght=700/a.png`, set with `instance`
+    before the instance's glyphs are written, and its traces carry its
+    "font" and "location". `start_run` empties the traces of the
+    instances about to be fitted, so traces.jsonl holds one run only.
+
+    Writes are queued and done on a background thread, so encoding PNGs
+    and file I/O stay off the fitting path. The queue holds at most
+    `max_queued` artifacts, blocking producers when the disk falls behind
+    so memory stays bounded, and the thread drains it up to `batch_size`
+    at a time, appending a batch's traces in one write. The thread is only
+    started by the first artifact, so at ArtifactLevel.NONE nothing is
+    queued, encoded or written.
+
+    Components take an artifact writer at construction and default to
+    NULL_ARTIFACTS. Call `flush` to wait for queued writes, e.g. before
+    reading the artifacts, and `close` when done.
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path = "outputs/",
+        level: ArtifactLevel = ArtifactLevel.NONE,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.out_dir = Path(out_dir)
+        self.level = ArtifactLevel(level)
+        self.max_queued = max_queued
+        self.batch_size = batch_size
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._instance: tuple[Path, dict] = (self.out_dir, {})
+
+    def instance(self, font: str, location: dict[str, float] | None = None) -> None:
+        """Writes the artifacts that follow under the font instance's directory."""
+        stamp = {"font": font}
+        if location is not None:
+            stamp["location"] = location
+        self._instance = (self.out_dir / instance_name(font, location), stamp)
+
+    def start_run(self, instances) -> None:
+        """Removes the traces of (font, location) instances from earlier runs."""
+        if not self.wants(ArtifactLevel.TRACES):
+            return
+        self.flush()
+        for font, location in instances:
+            path = self.out_dir / instance_name(font, location) / TRACES_FILE
+            path.unlink(missing_ok=True)
+
+    def wants(self, level: ArtifactLevel) -> bool:
+        return self.level >= level
+
+    def raster(self, glyph: str, image: Image.Image | np.ndarray) -> None:
+        """A glyph's canvas, as a PIL image or a float canvas (1.0 background)."""
+        if self.wants(ArtifactLevel.RASTERS):
+            self._put("raster", glyph, image)
+
+    def sdf(self, glyph: str, field: np.ndarray) -> None:
+        """A glyph's transformed field, written as a grayscale heatmap."""
+        if self.wants(ArtifactLevel.SDF):
+            self._put("sdf", glyph, field)
+
+    def trace(self, record: dict) -> None:
+        """A search record with its step traces."""
+        if self.wants(ArtifactLevel.TRACES):
+            self._put("trace", None, record)
+
+    def flush(self) -> None:
+        """Blocks until every queued artifact is written."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._queue = None
+            self._thread = None
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        # Each process (e.g. a pool worker) starts its own writer thread.
+        state = self.__dict__.copy()
+        state["_queue"] = None
+        state["_thread"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _put(self, kind: str, glyph: str | None, payload) -> None:
+        directory, stamp = self._instance
+        if kind == "trace":
+            payload = {**stamp, **payload}
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._queue = queue.Queue(maxsize=self.max_queued)
+                    # Daemon, so an unflushed writer never keeps a process up.
+                    self._thread = threading.Thread(
+                        target=self._run, name="artifact-writer", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put((directory, kind, glyph, payload))
+
+    def _run(self) -> None:
+        artifact_queue = self._queue
+        while True:
+            batch = [artifact_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(artifact_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                self._write([artifact for artifact in batch if artifact is not None])
+            except Exception as e:
+                # Debug output must never fail a run.
+                print(f"Failed to write artifacts: {e!r}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    artifact_queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[tuple]) -> None:
+        traces = defaultdict(list)
+        for directory, kind, glyph, payload in batch:
+            directory.mkdir(parents=True, exist_ok=True)
+            if kind == "raster":
+                path = directory / f"{_file_stem(glyph)}.png"
+                _to_image(payload).save(path, format="png")
+            elif kind == "sdf":
+                path = directory / f"{_file_stem(glyph)}.sdf.png"
+                _heatmap(payload).save(path, format="png")
+            else:
+                traces[directory].append(json.dumps(payload, default=_to_json))
+        for directory, lines in traces.items():
+            with open(directory / TRACES_FILE, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+
+NULL_ARTIFACTS = ArtifactWriter()
+
+
+def instance_name(font: str, location: dict[str, float] | None = None) -> str:
+    """A font instance's file name, e.g. "Font.ttf" or "Font.ttf@wght=700"."""
+    if location is None:
+        return font
+    return font + "@" + ",".join(f"{tag}={value}" for tag, value in location.items())
+
+
+def _file_stem(glyph: str) -> str:
+    """The glyph itself when it is a safe file name, e.g. "a" -> "a",
+    otherwise its code points, e.g. "/" -> "uni002F"."""
+    if glyph.isascii() and glyph.isalnum():
+        return glyph
+    return "uni" + "".join(f"{ord(char):04X}" for char in glyph)
+
+
+def _to_image(image: Image.Image | np.ndarray) -> Image.Image:
+    if isinstance(image, Image.Image):
+        return image
+    return Image.fromarray(np.uint8(np.rint(np.asarray(image) * 255)))
+
+
+def _heatmap(field: np.ndarray) -> Image.Image:
+    """Field scaled by its largest magnitude to 8 bit, 128 at zero."""
+    plane = np.asarray(field, dtype=np.float32)
+    if plane.ndim > 2:
+        plane = plane.mean(axis=tuple(range(2, plane.ndim)))
+    peak = float(np.abs(plane).max()) or 1.0
+    return Image.fromarray(np.uint8(np.rint(127.5 + 127.5 * plane / peak)))
@@ -3,11 +3,28 @@ from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
     SDFVisualDensityAlgo,
     SDFVisualAreaAlgo,
 )
-from font_fitter_engine.searcher import StepSearcher
+from font_fitter_engine.searcher import PyramidSearcher, StepSearcher
 from font_fitter_engine.loader import TTF_Loader
+from font_fitter_engine.scanline_loader import ScanlineLoader
 from font_fitter_engine.engine import SpacingEngine
+from font_fitter_engine.artifacts import ArtifactLevel, ArtifactWriter
+from font_fitter_engine.disk_cache import DiskCache
+from font_fitter_engine.glyph_store import GlyphStore
+from font_fitter_engine.memory_cache import MemoryCache
+from font_fitter_engine.server import FittingServer
+from font_fitter_engine.transform_cache import TransformCache
+from font_fitter_engine.tracing import Tracer
 from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_gaussian_blur.gaussain_blur import BlurAlgo
+from font_fitter_engine.algo_gaussian_blur.raster_2_blur_generator import (
+    Raster2BlurGenerator,
+)
+from font_fitter_engine.algo_sdf.scanline_2_sdf_generator import (
+    DEFAULT_MAX_DISTANCE,
+    Scanline2SDFGenerator,
+)
 from enum import Enum
+import sys
 from typing_extensions import Annotated
 
 
@@ -17,30 +34,323 @@ BASE_SET: list[str] = ["a", "b", "H", "c", "y", "O"]
 app = typer.Typer()
 
 
+class ArtifactsEnum(str, Enum):
+    none = "none"
+    rasters = "rasters"
+    sdf = "sdf"
+    traces = "traces"
+
+
 class StyleEnum(str, Enum):
     run = "run"
     validate = "validate"
+    kern = "kern"
+    serve = "serve"
+
+
+def parse_location(text: str) -> dict[str, float]:
+    """'wght=700,wdth=100' -> {"wght": 700.0, "wdth": 100.0}"""
+    location = {}
+    for part in text.split(","):
+        tag, _, value = part.partition("=")
+        try:
+            location[tag.strip()] = float(value)
+        except ValueError:
+            raise typer.BadParameter(f"Expected axis=value, got {part!r}")
+    return location
 
 
 @app.command("main")
 def main(
-    style: Annotated[StyleEnum, typer.Argument(help="run or validate")],
-    font_file_path: Annotated[str, typer.Argument()],
+    style: Annotated[StyleEnum, typer.Argument(help="run, validate, kern or serve")],
+    font_file_path: Annotated[
+        str,
+        typer.Argument(help="Directory of fonts, or the Unix socket to serve on"),
+    ],
+    workers: Annotated[
+        int, typer.Option(help="Number of processes fitting fonts in parallel")
+    ] = 1,
+    threads: Annotated[
+        int,
+        typer.Option(help="Threads rasterising and transforming glyphs of a font"),
+    ] = 1,
+    ordered: Annotated[
+        bool,
+        typer.Option(
+            "--ordered/--as-completed",
+            help="Report fonts in directory order or as soon as each finishes",
+        ),
+    ] = True,
+    cache_dir: Annotated[
+        str | None,
+        typer.Option(help="Directory caching rasters and SDFs between runs"),
+    ] = None,
+    glyph_store: Annotated[
+        bool,
+        typer.Option(
+            help="Keep rasters and SDFs in memory-mapped temporary files "
+            "instead of the process heap"
+        ),
+    ] = False,
+    manifest_dir: Annotated[
+        str | None,
+        typer.Option(
+            help="Keep per-glyph outline hashes and results here, and on the "
+            "next run only refit glyphs that changed"
+        ),
+    ] = None,
+    port: Annotated[
+        int | None,
+        typer.Option(help="With serve, listen on this localhost TCP port instead"),
+    ] = None,
+    output: Annotated[
+        str | None,
+        typer.Option(help="Write result records to this JSONL file, not stdout"),
+    ] = None,
+    write_fonts: Annotated[
+        str | None,
+        typer.Option(
+            help="With run, write a copy of every font with the fitted "
+            "sidebearings applied to this directory"
+        ),
+    ] = None,
+    write_algo: Annotated[
+        str | None,
+        typer.Option(
+            help="With --write-fonts, apply the fits of this algo, e.g. "
+            "SDFVisualAreaAlgo; by default the first one"
+        ),
+    ] = None,
+    write_target: Annotated[
+        int | None,
+        typer.Option(
+            help="With --write-fonts, apply the fits at this target density, "
+            "one of --target-density; by default the first one"
+        ),
+    ] = None,
+    target_density: Annotated[
+        list[int] | None,
+        typer.Option(
+            help="Target density the search fits each glyph to; repeat for "
+            "several, by default 100, 200 and 300"
+        ),
+    ] = None,
+    grayscale: Annotated[
+        bool,
+        typer.Option(
+            help="Rasterise to 2-D float32 coverage canvases instead of RGBA images"
+        ),
+    ] = False,
+    full_cmap: Annotated[
+        bool,
+        typer.Option(
+            help="Fit every character of each font's cmap that has an outline, "
+            "instead of the base glyph set"
+        ),
+    ] = False,
+    chunk_size: Annotated[
+        int | None,
+        typer.Option(
+            help="Process this many glyphs at a time, releasing their rasters "
+            "and SDFs before the next chunk"
+        ),
+    ] = None,
+    named_instances: Annotated[
+        bool,
+        typer.Option(help="Fit variable fonts at every named instance"),
+    ] = False,
+    instance: Annotated[
+        list[str] | None,
+        typer.Option(
+            help="Fit variable fonts at this location, e.g. 'wght=700,wdth=100'; "
+            "repeat for several instances"
+        ),
+    ] = None,
+    lazy: Annotated[
+        bool,
+        typer.Option(
+            help="Decompile only the tables and glyphs fitted and scale them on "
+            "the fly, instead of rescaling the whole font on load"
+        ),
+    ] = False,
+    max_distance: Annotated[
+        float | None,
+        typer.Option(
+            help="Bound the SDF to this distance in pixels, transforming only "
+            "the band around each glyph"
+        ),
+    ] = None,
+    pyramid: Annotated[
+        int,
+        typer.Option(
+            help="Search rasters downsampled by this factor first and refine "
+            "near the result at full resolution; 1 searches at full resolution"
+        ),
+    ] = 1,
+    accuracy_sample: Annotated[
+        int,
+        typer.Option(
+            help="With --pyramid, report each font's error against a full "
+            "resolution search, measured on this many glyphs; each costs a "
+            "full resolution search"
+        ),
+    ] = 0,
+    scanline: Annotated[
+        bool,
+        typer.Option(
+            help="Measure glyphs analytically from their outlines, with "
+            "horizontal distances, instead of rasterising them"
+        ),
+    ] = False,
+    blur: Annotated[
+        float | None,
+        typer.Option(
+            help="Measure darkness on rasters gaussian blurred with this radius "
+            "in pixels, instead of on their SDF"
+        ),
+    ] = None,
+    artifacts: Annotated[
+        ArtifactsEnum,
+        typer.Option(
+            help="Debug images and traces to write: none, rasters, sdf heatmaps "
+            "too, or search traces too"
+        ),
+    ] = ArtifactsEnum.none,
+    artifacts_dir: Annotated[
+        str,
+        typer.Option(help="Directory debug artifacts are written to"),
+    ] = "outputs/",
+    trace: Annotated[
+        str | None,
+        typer.Option(
+            help="Write a Chrome trace of the pipeline stages to this JSON file "
+            "and print a per-stage summary"
+        ),
+    ] = None,
 ):
-    print("Starting font-fitter-engine...")
+    print("Starting font-fitter-engine...", file=sys.stderr)
 
-    loader = TTF_Loader(
-        glyph_set=BASE_SET,
-        save_dir="outputs/",
+    instances = None
+    if named_instances:
+        instances = "named"
+    elif instance:
+        instances = [parse_location(location) for location in instance]
+
+    disk_cache = DiskCache(cache_dir) if cache_dir is not None else None
+    if style == "serve" and disk_cache is None:
+        # The server keeps rasters and SDFs of the fonts it has seen warm.
+        disk_cache = MemoryCache()
+    tracer = Tracer() if trace is not None else None
+    artifact_writer = ArtifactWriter(
+        artifacts_dir, level=ArtifactLevel[artifacts.value.upper()]
     )
+    if blur is not None and (scanline or pyramid > 1):
+        raise typer.BadParameter("--blur needs rasters, not --scanline or --pyramid")
+    if blur is not None and max_distance is not None:
+        raise typer.BadParameter("--max-distance bounds an SDF, not a --blur field")
+    if blur is not None and style == "kern":
+        raise typer.BadParameter("kern has no pair measure for --blur")
+    if scanline:
+        if pyramid > 1:
+            raise typer.BadParameter("--pyramid needs rasters, not --scanline")
+        if grayscale or cache_dir is not None or glyph_store:
+            raise typer.BadParameter(
+                "--grayscale, --cache-dir and --glyph-store need rasters, "
+                "not --scanline"
+            )
+        loader = ScanlineLoader(
+            glyph_set=BASE_SET,
+            save_dir=None,
+            threads=threads,
+            tracer=tracer,
+            lazy=lazy,
+            artifacts=artifact_writer,
+        )
+        transform = Scanline2SDFGenerator(
+            max_distance=max_distance or DEFAULT_MAX_DISTANCE, tracer=tracer
+        )
+    else:
+        loader = TTF_Loader(
+            glyph_set=BASE_SET,
+            save_dir=None,
+            threads=threads,
+            cache=disk_cache,
+            tracer=tracer,
+            grayscale=grayscale,
+            lazy=lazy,
+            artifacts=artifact_writer,
+            store=GlyphStore() if glyph_store else None,
+        )
+        transform = Raster2SDFGenerator(max_distance=max_distance, tracer=tracer)
     algos = [SDFVisualDensityAlgo(), SDFVisualAreaAlgo()]
-    searcher = StepSearcher(
-        algos=algos, glyph_set=BASE_SET, step_size=2, transform=Raster2SDFGenerator()
+    if blur is not None:
+        transform = Raster2BlurGenerator(blur_radius=blur, tracer=tracer)
+        algos = [BlurAlgo()]
+    if (write_algo is not None or write_target is not None) and write_fonts is None:
+        raise typer.BadParameter("--write-algo and --write-target need --write-fonts")
+    algo_names = [type(algo).__name__ for algo in algos]
+    if write_algo is not None and write_algo not in algo_names:
+        raise typer.BadParameter(
+            f"--write-algo must be one of {', '.join(algo_names)}, not {write_algo}"
+        )
+    searcher_options = dict(
+        algos=algos,
+        glyph_set=BASE_SET,
+        step_size=2,
+        transform=transform,
+        cache=TransformCache(
+            disk=disk_cache, store=GlyphStore() if glyph_store else None
+        ),
+        tracer=tracer,
+        artifacts=artifact_writer,
     )
-    engine = SpacingEngine(loader=loader, searcher=searcher)
+    if target_density:
+        searcher_options["target_densities"] = target_density
+    if pyramid > 1:
+        searcher = PyramidSearcher(factor=pyramid, **searcher_options)
+    else:
+        searcher = StepSearcher(**searcher_options)
+    engine = SpacingEngine(
+        loader=loader,
+        searcher=searcher,
+        tracer=tracer,
+        chunk_size=chunk_size,
+        full_cmap=full_cmap,
+        instances=instances,
+        manifest_dir=manifest_dir,
+        accuracy_sample=accuracy_sample if pyramid > 1 else 0,
+    )
+    if write_target is not None and write_target not in searcher.target_densities:
+        raise typer.BadParameter("--write-target must be one of --target-density")
+    written = True
     if style == "run":
-        engine.run(font_file_path)
+        reports = engine.run(
+            font_file_path,
+            workers=workers,
+            ordered=ordered,
+            output=output,
+            write_fonts=write_fonts,
+            write_algo=write_algo,
+            write_target=write_target,
+        )
+        if write_fonts is not None:
+            written = any(report.written for report in reports.values())
     elif style == "validate":
-        engine.validate(font_file_path)
+        engine.validate(font_file_path, workers=workers, ordered=ordered, output=output)
+    elif style == "kern":
+        engine.kern(font_file_path, workers=workers, ordered=ordered, output=output)
+    elif style == "serve":
+        if full_cmap:
+            raise typer.BadParameter("serve fits the glyphs each request asks for")
+        FittingServer(engine, workers=workers).run(font_file_path, port=port)
     else:
         raise NotImplementedError(f"Style {style} not implemented")
+    artifact_writer.close()
+
+    if tracer is not None:
+        tracer.save_chrome_trace(trace)
+        print(tracer.format_summary(), file=sys.stderr)
+        print(f"Trace saved to: {trace}", file=sys.stderr)
+
+    if not written:
+        raise typer.Exit(code=1)
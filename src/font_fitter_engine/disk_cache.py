@@ -0,0 +1,116 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+# Eviction frees space down to this fraction of max_bytes, so a full cache
+# is not rescanned on every put.
+DEFAULT_LOW_WATER = 0.9
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class DiskCache:
+    """
+    Content-addressed store of named numpy arrays, one uncompressed .npz per
+    key under `cache_dir`. Keys are digests of whatever identifies the
+    content (font file hash, glyph, raster/transform parameters), so a
+    changed font or config simply misses.
+
+    Once the store grows past `max_bytes` the least recently used entries
+    are removed until it is under `low_water` times `max_bytes`. Writes are
+    atomic, so several processes can share a cache directory; the size is
+    tracked per process and recounted on every eviction.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        low_water: float = DEFAULT_LOW_WATER,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = sum(path.stat().st_size for path in self._entries())
+
+    @staticmethod
+    def hash_file(path: str | Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Truncated or foreign file, drop it and recompute.
+            self._remove(path)
+            return None
+        # mtime doubles as the last access time for eviction.
+        os.utime(path)
+        return arrays
+
+    def put(self, key: str, arrays: dict[str, np.ndarray]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        replaced = self._file_size(path)
+        os.replace(tmp_path, path)
+        self._size += path.stat().st_size - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        target = self.low_water * self.max_bytes
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+    def clear(self) -> None:
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+    def _remove(self, path: Path) -> None:
+        size = self._file_size(path)
+        path.unlink(missing_ok=True)
+        self._size -= size
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npz"
+
+    def _entries(self):
+        return self.cache_dir.glob("*/*.npz")
@@ -1,6 +1,27 @@
-from font_fitter_engine.loader import Loader
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from font_fitter_engine.artifacts import instance_name
+from font_fitter_engine.disk_cache import DiskCache
+from font_fitter_engine.font_writer import SidebearingWriter, WriteReport
+from font_fitter_engine.kerning import (
+    PAIR_MEASURES,
+    KerningEngine,
+    SideProfile,
+    sidebearings_from_spacing,
+)
+from font_fitter_engine.loader import ImgOut, Loader
+from font_fitter_engine.manifest import Manifest
 from font_fitter_engine.searcher import Searcher
+from font_fitter_engine.results import JSONLWriter
+from font_fitter_engine.tracing import NULL_TRACER, Tracer
+from multiprocessing import Manager
 from pathlib import Path
+from queue import Empty
+from typing import Iterator, Literal
+import sys
+
+Location = dict[str, float]
 
 
 class SpacingEngine:
@@ -8,66 +29,653 @@ class SpacingEngine:
         self,
         loader,
         searcher,
+        tracer: Tracer | None = None,
+        kerning: list[KerningEngine] | None = None,
+        chunk_size: int | None = None,
+        full_cmap: bool = False,
+        instances: list[Location] | Literal["named"] | None = None,
+        manifest_dir: str | Path | None = None,
+        accuracy_sample: int = 0,
     ) -> None:
+        """
+        kerning configures the "kern" style; by default pairs are kerned
+        with every searcher algo that has a pair measure.
+        full_cmap fits every character of each font's cmap that has an
+        outline instead of the loader's glyph set. chunk_size processes
+        that many glyphs at a time: each chunk is rasterised, transformed
+        and searched, its records streamed out and its rasters and SDFs
+        released before the next, so memory is bounded by the chunk rather
+        than the font.
+        instances fits variable fonts at several design-space locations,
+        "named" for every fvar named instance or a list of user-space axis
+        locations such as [{"wght": 400}, {"wght": 700}]. Each (font,
+        instance) is a separate unit of work, run in parallel across
+        workers, and its records carry a "location" key, so per-instance
+        sidebearings can be interpolated between masters. Static fonts are
+        fitted once, as usual.
+        manifest_dir keeps a Manifest per font instance of the "run" style:
+        per-glyph outline and metric hashes, the config hash and the records.
+        On the next run only glyphs whose hash changed are rasterised,
+        transformed and searched; the others yield their stored records.
+        accuracy_sample, with a searcher that reports an accuracy bound
+        (PyramidSearcher), ends each font instance of the "run" style with
+        a summary record: the "accuracy_bound" of its results against a full
+        resolution StepSearcher, on that many glyphs spread over the glyphs
+        fitted. Each costs a full resolution search, so it is off by default.
+        tracer records a span per font stage. Give the loader, searcher and
+        transform the same tracer to see the whole pipeline in one trace;
+        spans recorded in pool workers are merged back into it.
+        """
         self.loader: Loader = loader
         self.searcher: Searcher = searcher
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.kerning = kerning
+        self.chunk_size = chunk_size
+        self.full_cmap = full_cmap
+        self.instances = instances
+        self.manifest_dir = None if manifest_dir is None else Path(manifest_dir)
+        self.accuracy_sample = accuracy_sample
 
-    def run(self, path):
-        path_b = Path(path)
-        if not path_b.is_dir():
-            raise NotImplementedError("Path should be a directory")
-        for file in path_b.iterdir():
-            print(f"Processing file {file}")
-            self.loader.load(path=file)
-            img_out = self.loader.process()
-            calculated_spaces = self.searcher.search(img_out=img_out)
-            print(calculated_spaces)
-        print("Run complete")
+    def run(
+        self,
+        path,
+        workers: int = 1,
+        ordered: bool = True,
+        output: str | None = None,
+        write_fonts: str | None = None,
+        write_algo: str | None = None,
+        write_target: int | None = None,
+    ) -> dict[str, WriteReport]:
+        """
+        Fit every font in the directory at `path`.
+        With `workers` > 1 fonts are fitted in a process pool. `ordered`
+        reports results in directory order, otherwise as they complete.
+        Records go to the JSONL file `output`, or to stdout without one.
+        With `write_fonts`, a copy of every font with the fitted sidebearings
+        of `write_algo` at `write_target` applied is written to that
+        directory, by default those of the first algo and target density;
+        see SidebearingWriter for the glyphs it leaves as they are. Fonts it
+        cannot write (CFF outlines) are rejected up front.
+        Returns the WriteReport of every font written, empty without
+        `write_fonts`.
+        """
+        if write_fonts is not None:
+            unwritable = [
+                file.name
+                for file in self._font_dir(path).iterdir()
+                if not _can_write(file)
+            ]
+            if unwritable:
+                raise ValueError(
+                    "Only TrueType (glyf) fonts can be written, not "
+                    + ", ".join(sorted(unwritable))
+                )
+        records = self.iter_run(path, workers=workers, ordered=ordered)
+        reports = {}
+        if write_fonts is None:
+            self._emit(records, output)
+        else:
+            fitted = []
+            self._emit(_collect(records, fitted), output)
+            if write_algo is None:
+                write_algo = type(self.searcher.algos[0]).__name__
+            if write_target is None:
+                write_target = self.searcher.target_densities[0]
+            writer = SidebearingWriter(algo=write_algo, target_density=write_target)
+            reports = writer.write_family(path, fitted, write_fonts)
+            for name, report in reports.items():
+                if report.error is not None:
+                    print(f"Failed to write {name}: {report.error}", file=sys.stderr)
+                    continue
+                print(
+                    f"Wrote {len(report.written)} glyphs of {name} to {write_fonts}",
+                    file=sys.stderr,
+                )
+                for glyph, reason in report.skipped.items():
+                    print(f"  skipped {glyph!r}: {reason}", file=sys.stderr)
+            if not any(report.written for report in reports.values()):
+                print(
+                    f"Warning: no glyph was written; no {write_algo} fit at "
+                    f"target density {write_target} was close enough to apply. "
+                    "Pick another algo or target density to write.",
+                    file=sys.stderr,
+                )
+        print("Run complete", file=sys.stderr)
+        return reports
 
-    def validate(self, path: str):
+    def validate(
+        self,
+        path: str,
+        workers: int = 1,
+        ordered: bool = True,
+        output: str | None = None,
+    ):
         """
         Supply a path that is a directory or file.
         """
+        self._emit(self.iter_validate(path, workers=workers, ordered=ordered), output)
+        print("Validation complete", file=sys.stderr)
+
+    def iter_run(self, path, workers: int = 1, ordered: bool = True) -> Iterator[dict]:
+        """
+        Yields one record per font, glyph, algo and target density as soon as
+        it is fitted. A font that fails yields a single record with an
+        "error" key instead.
+        """
+        yield from self._map_fonts("run", self._font_dir(path), workers, ordered)
+
+    def kern(
+        self,
+        path,
+        workers: int = 1,
+        ordered: bool = True,
+        output: str | None = None,
+    ):
+        """Kern every pair of the glyph set of every font in `path`."""
+        self._emit(self.iter_kern(path, workers=workers, ordered=ordered), output)
+        print("Kerning complete", file=sys.stderr)
+
+    def iter_kern(self, path, workers: int = 1, ordered: bool = True) -> Iterator[dict]:
+        """Like iter_run, with one record per font, algo and kerned pair."""
+        yield from self._map_fonts("kern", self._font_dir(path), workers, ordered)
+
+    def iter_validate(
+        self, path, workers: int = 1, ordered: bool = True
+    ) -> Iterator[dict]:
+        """Like iter_run, with one record per font, glyph and algo."""
+        yield from self._map_fonts("validate", self._font_dir(path), workers, ordered)
+
+    def fit_glyphs(
+        self,
+        style: str,
+        file: Path,
+        glyphs: list[str],
+        location: Location | None = None,
+    ) -> list[dict]:
+        """
+        Records of `style` for just `glyphs` of one font (instance), for
+        callers like FittingServer that choose glyphs per request. A font
+        the loader already has open is not parsed again. The engine should
+        not be in full_cmap mode, which would fit the whole cmap instead.
+        Only glyph records are returned, never an accuracy summary.
+        """
+        with self._narrowed(list(glyphs)):
+            return list(self._process_font(style, Path(file), location, accuracy=False))
+
+    def process_pool(self, workers: int) -> ProcessPoolExecutor:
+        """A pool of `workers` processes, each holding a copy of this engine
+        for _process_font_in_worker and _fit_glyphs_in_worker."""
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self.loader,
+                self.searcher,
+                self.tracer,
+                self.kerning,
+                self.chunk_size,
+                self.full_cmap,
+                self.instances,
+                self.manifest_dir,
+                self.accuracy_sample,
+            ),
+        )
+
+    def iter_fit_font(
+        self, file: Path, location: Location | None = None, accuracy: bool = True
+    ) -> Iterator[dict]:
+        """
+        Yields the font instance's records as each glyph is fitted, then,
+        with accuracy and an accuracy_sample, its accuracy summary.
+        """
+        print(f"Processing file {file}", file=sys.stderr)
+        glyphs = self._load(file, location)
+        if self.manifest_dir is None:
+            manifest = None
+            changed = glyphs
+        else:
+            manifest = Manifest(
+                self._manifest_path(file, location),
+                DiskCache.key(self.loader.cache_key(), self.searcher.cache_key()),
+            )
+            with self.tracer.span("hash", category="engine", font=file.name):
+                with self._narrowed(glyphs):
+                    hashes = self.loader.glyph_hashes()
+            changed = []
+            for glyph in glyphs:
+                records = manifest.get(glyph, hashes[glyph])
+                if records is None:
+                    changed.append(glyph)
+                else:
+                    yield from records
+
+        sample = []
+        if accuracy and hasattr(self.searcher, "accuracy_bound"):
+            sample = self._accuracy_sample(changed)
+        bounds = None
+        try:
+            for img_out in self._iter_chunks(file, changed):
+                sampled = {}
+                for glyph, glyph_results in self.searcher.iter_search(img_out=img_out):
+                    if glyph in sample:
+                        sampled[glyph] = glyph_results
+                    records = [
+                        {
+                            "font": file.name,
+                            "glyph": glyph,
+                            "algo": type(algo).__name__,
+                            "target_density": target_density,
+                            **result.to_dict(),
+                        }
+                        for algo, targets in glyph_results.items()
+                        for target_density, result in targets.items()
+                    ]
+                    if manifest is not None:
+                        manifest.put(glyph, hashes[glyph], records)
+                    yield from records
+                if sampled:
+                    # While the chunk's rasters are still out.
+                    with self.tracer.span(
+                        "accuracy", category="engine", font=file.name
+                    ):
+                        bounds = self.searcher.accuracy_bound(img_out, sampled, bounds)
+        finally:
+            # Glyphs fitted so far are kept even if the font fails midway.
+            if manifest is not None:
+                manifest.save(glyphs)
+
+        if bounds is not None:
+            yield {"font": file.name, "sample": sample, "accuracy_bound": bounds}
+
+    def _accuracy_sample(self, glyphs: list[str]) -> list[str]:
+        """accuracy_sample glyphs spread over the glyphs to fit."""
+        if self.accuracy_sample <= 0:
+            return []
+        step = max(1, len(glyphs) // self.accuracy_sample)
+        return glyphs[::step][: self.accuracy_sample]
+
+    def iter_validate_font(
+        self, file: Path, location: Location | None = None
+    ) -> Iterator[dict]:
+        for img_out in self._iter_chunks(file, self._load(file, location)):
+            yield from self._validate_chunk(file, img_out)
+
+    def _validate_chunk(self, file: Path, img_out: dict[str, ImgOut]) -> Iterator[dict]:
+        spacing = self.loader.get_spacing()
+
+        for glyph in self.loader.glyph_set:
+            height, width = img_out[glyph].canvas_shape
+            glyph_spacing = spacing[glyph]
+            lsb = glyph_spacing.lsb
+            center_x = width // 2
+            sdf_array = self.searcher.transform_glyph(glyph, img_out[glyph])
+            x1 = center_x - lsb
+            y1 = 0
+            x2 = center_x
+            y2 = height
+
+            area = (x1, y1, x2, y2)
+            for algo in self.searcher.algos:
+                with self.tracer.span(
+                    "calculate",
+                    category="engine",
+                    glyph=glyph,
+                    algo=type(algo).__name__,
+                ):
+                    calculated_darkness = algo.calculate(sdf_array, area)
+                yield {
+                    "font": file.name,
+                    "glyph": glyph,
+                    "algo": type(algo).__name__,
+                    "calc_val": calculated_darkness,
+                    "lsb": lsb,
+                }
+
+    def iter_kern_font(
+        self, file: Path, location: Location | None = None
+    ) -> Iterator[dict]:
+        # Profiles are a few KB per glyph, so only they outlive their chunk.
+        sidebearings = {}
+        profiles = {}
+        for img_out in self._iter_chunks(file, self._load(file, location)):
+            sidebearings.update(sidebearings_from_spacing(self.loader.get_spacing()))
+            with self.tracer.span("profile", category="engine", font=file.name):
+                for glyph in self.loader.glyph_set:
+                    profiles[glyph] = SideProfile.from_sdf(
+                        self.searcher.transform_glyph(glyph, img_out[glyph])
+                    )
+
+        kerning = self.kerning
+        if kerning is None:
+            kerning = [
+                KerningEngine(algo)
+                for algo in self.searcher.algos
+                if type(algo) in PAIR_MEASURES
+            ]
+        if not kerning:
+            raise NotImplementedError("No searcher algo has a pair measure to kern")
+        for kerner in kerning:
+            with self.tracer.span("kern", category="engine", font=file.name):
+                table = kerner.kerning_table(profiles, sidebearings)
+            for (left, right), kern in table.items():
+                yield {
+                    "font": file.name,
+                    "algo": type(kerner.algo).__name__,
+                    "left": left,
+                    "right": right,
+                    "kern": kern,
+                }
+
+    def _load(self, file: Path, location: Location | None = None) -> list[str]:
+        """Loads the font, at location if given, and returns the glyphs to
+        fit: the loader's glyph set, or the whole cmap with full_cmap."""
+        with self.tracer.span("load", category="engine", font=file.name):
+            self.loader.load(path=file, location=location)
+        self.loader.artifacts.instance(file.name, location)
+        self.searcher.artifacts.instance(file.name, location)
+        if self.full_cmap:
+            return self.loader.cmap_glyphs()
+        return self.loader.glyph_set
+
+    def _iter_chunks(
+        self, file: Path, glyphs: list[str]
+    ) -> Iterator[dict[str, ImgOut]]:
+        """
+        Yields the rasters of the loaded font's glyphs, chunk_size at a time.
+        While a chunk is out, the loader's and searcher's glyph sets are
+        narrowed to it. Once the consumer asks for the next chunk the
+        previous one is cleared and the transform cache emptied, so its
+        arrays can be freed before the next chunk is rasterised.
+        With loader threads, a chunk's transforms are computed up front into
+        the transform cache, so chunks are capped at its maxsize: a bigger
+        chunk would evict them before they are searched and redo them.
+        """
+        chunk_size = self.chunk_size or max(1, len(glyphs))
+        if self.loader.threads > 1 and self.searcher.cache.maxsize > 0:
+            chunk_size = min(chunk_size, self.searcher.cache.maxsize)
+        try:
+            for start in range(0, len(glyphs), chunk_size):
+                chunk = glyphs[start : start + chunk_size]
+                with self._narrowed(chunk):
+                    self.searcher.cache.clear()
+                    img_out = self._process_chunk(file, chunk)
+                    yield img_out
+                    img_out.clear()
+        finally:
+            self.searcher.cache.clear()
+
+    @contextmanager
+    def _narrowed(self, glyphs: list[str]) -> Iterator[None]:
+        """Sets the loader's and searcher's glyph sets to glyphs."""
+        glyph_set = self.loader.glyph_set
+        searcher_glyph_set = self.searcher.glyph_set
+        self.loader.glyph_set = self.searcher.glyph_set = glyphs
+        try:
+            yield
+        finally:
+            self.loader.glyph_set = glyph_set
+            self.searcher.glyph_set = searcher_glyph_set
+
+    def _manifest_path(self, file: Path, location: Location | None) -> Path:
+        return self.manifest_dir / f"{instance_name(file.name, location)}.json"
+
+    def _process_chunk(self, file: Path, chunk: list[str]) -> dict[str, ImgOut]:
+        with self.tracer.span(
+            "process", category="engine", font=file.name, glyphs=len(chunk)
+        ):
+            img_out = self.loader.process()
+        if self.loader.threads > 1 and self.searcher.cache.maxsize > 0:
+            with self.tracer.span(
+                "transform", category="engine", font=file.name, glyphs=len(chunk)
+            ):
+                self.searcher.transform_glyphs(img_out, threads=self.loader.threads)
+        return img_out
+
+    @staticmethod
+    def _font_dir(path) -> Path:
         path_b = Path(path)
         if not path_b.is_dir():
             raise NotImplementedError("Path should be a directory")
+        return path_b
 
-        validation_dict = {}
-        for file in path_b.iterdir():
-            filename = file.name
-            self.loader.load(path=file)
-            img_out = self.loader.process()
-            spacing = self.loader.get_spacing()
-
-            for glyph in self.loader.glyph_set:
-                img = img_out[glyph].array
-                height, width, c = img.shape
-                glyph_spacing = spacing[glyph]
-                lsb = glyph_spacing.lsb
-
-                rsb = glyph_spacing.lsb
-                center_x = width // 2
-                sdf_array = self.searcher.transform.generate(img)
-                x1 = center_x - lsb
-                y1 = 0
-                x2 = center_x
-                y2 = height
-
-                area = (x1, y1, x2, y2)
-                for algo in self.searcher.algos:
-                    calculated_darkness = algo.calculate(sdf_array, area)
-                    if validation_dict.get(filename, None) is None:
-                        validation_dict[filename] = {}
+    @staticmethod
+    def _emit(records: Iterator[dict], output: str | None) -> None:
+        """Writes records as NDJSON to the file `output`, or to stdout
+        without one; errors and summaries are also reported on stderr."""
+        with JSONLWriter(output if output is not None else "-") as writer:
+            for record in records:
+                if "error" in record:
+                    print(
+                        f"Failed to process file {record['font']}: {record['error']}",
+                        file=sys.stderr,
+                    )
+                if "accuracy_bound" in record:
+                    print(
+                        f"Accuracy bound of {record['font']} on "
+                        f"{len(record['sample'])} glyphs: {record['accuracy_bound']}",
+                        file=sys.stderr,
+                    )
+                writer.write(record)
 
-                    if validation_dict[filename].get(algo, None) is None:
-                        validation_dict[filename][algo] = {}
-                    if validation_dict[filename][algo].get(glyph, None) is None:
-                        validation_dict[filename][algo][glyph] = {}
+    def _map_fonts(
+        self, style: str, path_b: Path, workers: int = 1, ordered: bool = True
+    ) -> Iterator[dict]:
+        """
+        Yields the records of every font. A font that raises is reported
+        as an error record and does not stop the rest of the batch.
+        """
+        units = [
+            (file, location)
+            for file in path_b.iterdir()
+            for location in self._locations(file)
+        ]
+        self.searcher.artifacts.start_run(
+            (file.name, location) for file, location in units
+        )
+        if workers <= 1:
+            for file, location in units:
+                try:
+                    yield from self._process_font(style, file, location)
+                except Exception as e:
+                    yield self._error_record(file, location, e)
+            self._flush_artifacts()
+            return
+
+        # Workers send records back in batches as they are fitted, rather
+        # than a whole font's at once.
+        with Manager() as manager, self.process_pool(workers) as pool:
+            queue = manager.Queue()
+            futures: dict[Future, int] = {
+                pool.submit(
+                    _process_font_in_worker, style, file, location, queue, index
+                ): index
+                for index, (file, location) in enumerate(units)
+            }
+            yield from self._receive_records(futures, units, queue, ordered)
+
+    def _receive_records(
+        self,
+        futures: dict[Future, int],
+        units: list[tuple[Path, Location | None]],
+        queue,
+        ordered: bool,
+    ) -> Iterator[dict]:
+        """
+        Yields the batches _process_font_in_worker puts on `queue` for each
+        unit. `ordered` holds back batches of later units until the ones
+        before them finish; otherwise every batch is yielded on arrival.
+        """
+        received: dict[int, list[dict]] = defaultdict(list)
+
+        def receive(timeout: float | None) -> None:
+            try:
+                index, records = queue.get(timeout=timeout)
+                received[index].extend(records)
+                # Take whatever else already arrived without waiting.
+                while True:
+                    index, records = queue.get_nowait()
+                    received[index].extend(records)
+            except Empty:
+                pass
+
+        pending = list(futures)
+        while pending:
+            current = pending[:1] if ordered else list(pending)
+            done = [future for future in current if future.done()]
+            if done:
+                # A worker's puts return once the manager has them, so the
+                # batches of a finished unit are all on the queue by now.
+                receive(timeout=0)
+            for future in current:
+                yield from received.pop(futures[future], [])
+            for future in done:
+                pending.remove(future)
+                file, location = units[futures[future]]
+                try:
+                    self.tracer.extend(future.result())
+                except Exception as e:
+                    yield self._error_record(file, location, e)
+            if not done:
+                receive(timeout=0.05)
+
+    def _flush_artifacts(self) -> None:
+        """Waits for the debug artifacts queued by the loader and searcher."""
+        self.loader.artifacts.flush()
+        self.searcher.artifacts.flush()
+
+    def _locations(self, file: Path) -> list[Location | None]:
+        """The instances of file to fit; [None] fits it at its default."""
+        if self.instances is None:
+            return [None]
+        try:
+            named = self.loader.named_instances(file)
+        except Exception:
+            # Unreadable fonts are reported when they are processed.
+            return [None]
+        if named is None:
+            return [None]
+        return named if self.instances == "named" else list(self.instances)
+
+    @staticmethod
+    def _error_record(file: Path, location: Location | None, error: Exception):
+        record = {"font": file.name, "error": repr(error)}
+        if location is not None:
+            record["location"] = location
+        return record
+
+    def _process_font(
+        self,
+        style: str,
+        file: Path,
+        location: Location | None = None,
+        accuracy: bool = True,
+    ) -> Iterator[dict]:
+        if style == "run":
+            records = self.iter_fit_font(file, location, accuracy=accuracy)
+        elif style == "validate":
+            records = self.iter_validate_font(file, location)
+        elif style == "kern":
+            records = self.iter_kern_font(file, location)
+        else:
+            raise NotImplementedError(f"Style {style} not implemented")
+        if location is None:
+            return records
+        return ({"font": file.name, "location": location, **r} for r in records)
+
+
+def _can_write(file: Path) -> bool:
+    try:
+        return SidebearingWriter.can_write(file)
+    except Exception:
+        # Unreadable fonts are reported when they are processed.
+        return True
+
+
+def _collect(records: Iterator[dict], collected: list[dict]) -> Iterator[dict]:
+    for record in records:
+        collected.append(record)
+        yield record
+
+
+_worker_engine: SpacingEngine | None = None
+
+
+def _init_worker(
+    loader: Loader,
+    searcher: Searcher,
+    tracer: Tracer,
+    kerning: list[KerningEngine] | None,
+    chunk_size: int | None,
+    full_cmap: bool,
+    instances: list[Location] | Literal["named"] | None,
+    manifest_dir: Path | None,
+    accuracy_sample: int,
+) -> None:
+    """Builds the engine once per worker process, so every font it fits
+    reuses the already imported modules and configured loader/searcher."""
+    global _worker_engine
+    _worker_engine = SpacingEngine(
+        loader=loader,
+        searcher=searcher,
+        tracer=tracer,
+        kerning=kerning,
+        chunk_size=chunk_size,
+        full_cmap=full_cmap,
+        instances=instances,
+        manifest_dir=manifest_dir,
+        accuracy_sample=accuracy_sample,
+    )
+
+
+# Records a worker sends back at once; a few glyphs' worth.
+RECORD_BATCH = 64
+
+
+def _process_font_in_worker(
+    style: str, file: Path, location: Location | None, queue, index: int
+) -> list[dict]:
+    """
+    Puts the font instance's records on `queue` as (index, records) batches
+    while they are fitted, so a font's records are never all held at once.
+    Returns the spans the worker recorded for it.
+    """
+    if _worker_engine is None:
+        raise RuntimeError("Worker engine not initialised.")
+    batch = []
+    try:
+        for record in _worker_engine._process_font(style, file, location):
+            batch.append(record)
+            if len(batch) == RECORD_BATCH:
+                queue.put((index, batch))
+                batch = []
+    finally:
+        # Like a serial run, the records fitted before an error still count.
+        if batch:
+            queue.put((index, batch))
+    _worker_engine._flush_artifacts()
+    return _drain_worker_events()
+
+
+def _drain_worker_events() -> list[dict]:
+    tracers = {
+        id(tracer): tracer
+        for tracer in (
+            _worker_engine.tracer,
+            _worker_engine.loader.tracer,
+            _worker_engine.searcher.tracer,
+            _worker_engine.searcher.transform.tracer,
+        )
+    }
+    return [event for tracer in tracers.values() for event in tracer.drain()]
 
-                    validation_dict[filename][algo][glyph]["calc_val"] = (
-                        calculated_darkness
-                    )
-                    validation_dict[filename][algo][glyph]["lsb"] = lsb
 
-        print(validation_dict)
-        print("Validation complete")
+def _fit_glyphs_in_worker(
+    style: str, file: Path, glyphs: list[str], location: Location | None
+) -> list[dict]:
+    """SpacingEngine.fit_glyphs on the worker's engine."""
+    if _worker_engine is None:
+        raise RuntimeError("Worker engine not initialised.")
+    records = _worker_engine.fit_glyphs(style, file, glyphs, location)
+    # Spans are not reported back from service jobs; drop them.
+    _drain_worker_events()
+    return records
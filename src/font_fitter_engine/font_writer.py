@@ -0,0 +1,223 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from fontTools.misc.roundTools import otRound
+from fontTools.ttLib import TTFont
+
+from font_fitter_engine.loader import SPACE
+
+# Tables that shifting outlines and setting metrics changes or recalculates.
+REBUILT_TABLES = {"glyf", "loca", "hmtx", "head", "hhea", "maxp", "OS/2"}
+# Tables cached from the old advances (device metrics) or signing the old
+# bytes; they would contradict the new hmtx, so they are dropped.
+DROPPED_TABLES = {"hdmx", "LTSH", "DSIG"}
+# Largest density diff applied, as a fraction of the target density.
+DEFAULT_TOLERANCE = 0.1
+
+
+@dataclass
+class WriteReport:
+    """What write() did to one font: the glyphs written, the glyphs left
+    as they were with the reason, or the error that kept it from writing."""
+
+    written: list[str] = field(default_factory=list)
+    skipped: dict[str, str] = field(default_factory=dict)
+    error: str | None = None
+
+
+class SidebearingWriter:
+    """
+    Applies fitted sidebearings to fonts: writes a copy of each font with
+    its glyphs' outlines shifted to the fitted lsb and their advances set
+    from the fitted lsb and rsb.
+
+    A "run" record's search windows are in canvas pixels at `scale` units
+    per em, where the glyph's ink spans [SPACE, SPACE + ink width); the
+    fitted lsb is from the left window's edge to the ink, the rsb from the
+    ink to the right window's edge. One record per glyph is applied, the
+    one of `algo` and `target_density`, by default the first seen.
+
+    A record is only applied when the search reached its target, within
+    `tolerance` times the target density on both sides, and both windows
+    end outside the glyph's ink, so no fitted sidebearing is negative.
+    Other glyphs keep their outline and metrics and are reported skipped.
+
+    Sidebearings are converted to font units for all glyphs at once, and
+    outlines are shifted in place on their array-backed GlyphCoordinates.
+    Only glyf, hmtx and the tables recalculated from them (head, hhea,
+    maxp, OS/2 xAvgCharWidth) are rebuilt, and the tables holding the old
+    advances (hdmx, LTSH) or a signature of the old bytes (DSIG) are
+    dropped; the other tables are copied as is. Composites are moved by
+    their component offsets, so that a composite keeps its own placement
+    when its components move. Variable fonts keep their variations, which
+    are relative to the shifted default outlines; records with a
+    "location" are skipped, as glyf holds only the default.
+    """
+
+    def __init__(
+        self,
+        algo: str | None = None,
+        target_density: int | None = None,
+        scale: int = 1000,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> None:
+        self.algo = algo
+        self.target_density = target_density
+        self.scale = scale
+        self.tolerance = tolerance
+
+    def select(self, records) -> dict[str, dict[str, dict]]:
+        """The record to apply per font file name and glyph."""
+        selected = defaultdict(dict)
+        algo, target_density = self.algo, self.target_density
+        for record in records:
+            if "error" in record or "location" in record or "lsb" not in record:
+                continue
+            if algo is None:
+                algo = record["algo"]
+            if target_density is None:
+                target_density = record["target_density"]
+            if (record["algo"], record["target_density"]) != (algo, target_density):
+                continue
+            selected[record["font"]].setdefault(record["glyph"], record)
+        return dict(selected)
+
+    @staticmethod
+    def can_write(font_path) -> bool:
+        """Whether the font has TrueType (glyf) outlines, which write() needs."""
+        with TTFont(font_path, lazy=True) as font:
+            return "glyf" in font
+
+    def write(self, font_path, records, output_path) -> WriteReport:
+        """
+        Writes the font at font_path, with the sidebearings of its records
+        applied, to output_path.
+        """
+        selected = self.select(records).get(Path(font_path).name, {})
+        return self._write(font_path, selected, output_path)
+
+    def write_family(self, path, records, output_dir) -> dict[str, WriteReport]:
+        """
+        write() for every font of the directory at path with records, into
+        output_dir under the same file names. A font that cannot be written
+        is reported with its error and does not stop the others.
+        """
+        reports = {}
+        for name, selected in self.select(records).items():
+            try:
+                reports[name] = self._write(
+                    Path(path) / name, selected, Path(output_dir) / name
+                )
+            except Exception as e:
+                reports[name] = WriteReport(error=repr(e))
+        return reports
+
+    def _write(self, font_path, records: dict[str, dict], output_path) -> WriteReport:
+        if not self.can_write(font_path):
+            raise NotImplementedError("Only TrueType (glyf) outlines can be written")
+        font = TTFont(font_path)
+        report = self._apply(font, records)
+        if "OS/2" in font:
+            font["OS/2"].recalcAvgCharWidth(font)
+        for tag in DROPPED_TABLES:
+            if tag in font:
+                del font[tag]
+        for tag in list(font.tables):
+            if tag not in REBUILT_TABLES:
+                # Only read (cmap, post): unload it, so it is copied as is.
+                del font.tables[tag]
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        font.save(output_path)
+        return report
+
+    def _apply(self, font: TTFont, records: dict[str, dict]) -> WriteReport:
+        report = WriteReport()
+        glyf = font["glyf"]
+        hmtx = font["hmtx"]
+        cmap = font.getBestCmap()
+        records_by_name = {}
+        glyph_by_name = {}
+        for glyph, record in records.items():
+            name = cmap[ord(glyph)]
+            if not glyf[name].numberOfContours:
+                report.skipped[glyph] = "no outline"
+                continue
+            tolerance = self.tolerance * record["target_density"]
+            diff = max(record["left_density_diff"], record["right_density_diff"])
+            if diff > tolerance:
+                report.skipped[glyph] = (
+                    f"density diff {diff:g} over tolerance {tolerance:g}"
+                )
+                continue
+            records_by_name[name] = record
+            glyph_by_name[name] = glyph
+        names = list(records_by_name)
+        if not names:
+            return report
+
+        # Bounds before anything moves, composites included.
+        bounds = np.empty((len(names), 2), np.int64)
+        for index, name in enumerate(names):
+            glyph = glyf[name]
+            glyph.recalcBounds(glyf)
+            bounds[index] = otRound(glyph.xMin), otRound(glyph.xMax)
+        left_edges = np.array(
+            [records_by_name[name]["optimal_area_left"][0] for name in names]
+        )
+        right_edges = np.array(
+            [records_by_name[name]["optimal_area_right"][2] for name in names]
+        )
+
+        units_per_px = font["head"].unitsPerEm / self.scale
+        # The loader's ink width in pixels, as scale_upem rounds the bounds.
+        ink_px = _ot_round(bounds[:, 1] / units_per_px) - _ot_round(
+            bounds[:, 0] / units_per_px
+        )
+        lsbs = _ot_round((SPACE - left_edges) * units_per_px)
+        rsbs = _ot_round((right_edges - SPACE - ink_px) * units_per_px)
+        # A window edge inside the ink bbox would make a sidebearing negative.
+        inside = (left_edges > SPACE) | (right_edges < SPACE + ink_px)
+        inside |= (lsbs < 0) | (rsbs < 0)
+        for index in np.flatnonzero(inside).tolist():
+            report.skipped[glyph_by_name[names[index]]] = (
+                f"window edge inside the ink (lsb {lsbs[index]}, rsb {rsbs[index]})"
+            )
+        keep = ~inside
+        names = [name for name, kept in zip(names, keep.tolist()) if kept]
+        if not names:
+            return report
+        bounds, lsbs, rsbs = bounds[keep], lsbs[keep], rsbs[keep]
+        shifts = lsbs - bounds[:, 0]
+        advances = lsbs + (bounds[:, 1] - bounds[:, 0]) + rsbs
+        shift_by_name = dict(zip(names, shifts.tolist()))
+
+        for name, shift in shift_by_name.items():
+            glyph = glyf[name]
+            if shift and not glyph.isComposite():
+                glyph.coordinates.translate((shift, 0))
+        # A composite moves by its own shift only, not by its components'.
+        for name in glyf.keys():
+            glyph = glyf[name]
+            if not glyph.isComposite():
+                continue
+            shift = shift_by_name.get(name, 0)
+            for component in glyph.components:
+                if not hasattr(component, "x"):
+                    # Placed by matching points, it follows its component.
+                    continue
+                moved = shift_by_name.get(component.glyphName, 0)
+                (xx, xy), _ = getattr(component, "transform", ((1, 0), (0, 1)))
+                component.x = otRound(component.x + shift - xx * moved)
+                component.y = otRound(component.y - xy * moved)
+
+        for name, advance, lsb in zip(names, advances.tolist(), lsbs.tolist()):
+            hmtx[name] = (int(advance), int(lsb))
+        report.written = [glyph_by_name[name] for name in names]
+        return report
+
+
+def _ot_round(values: np.ndarray) -> np.ndarray:
+    """fontTools.misc.roundTools.otRound over an array."""
+    return np.floor(np.asarray(values, np.float64) + 0.5).astype(np.int64)
@@ -0,0 +1,138 @@
+import atexit
+import json
+import mmap
+import os
+import tempfile
+import weakref
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+
+ALIGNMENT = 64
+
+
+class GlyphStore:
+    """
+    Append-only store of glyph arrays (rasters, SDFs) in a single file, with
+    an in-memory index of offset, shape and dtype per name. `get` returns a
+    read-only memory map of the stored bytes, so the arrays live in the page
+    cache rather than the process heap and readers never copy them.
+
+    Without a `path` the store uses a temporary file that is removed when
+    the store is garbage collected.
+
+    A store is bound to one process: one that is pickled or inherited by a
+    forked process (e.g. a pool worker) starts over as a fresh temporary
+    store there, rather than sharing the file.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix=".glyphs")
+            os.close(fd)
+        self.path = Path(path)
+        self.index: dict[str, tuple[int, tuple[int, ...], str]] = {}
+        self._lock = Lock()
+        self._open(truncate=True)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "GlyphStore":
+        """Reopen a store written with `save_index`, for reading or appending."""
+        store = cls.__new__(cls)
+        store._temporary = False
+        store.path = Path(path)
+        store._lock = Lock()
+        with open(store._index_path()) as f:
+            store.index = {
+                name: (offset, tuple(shape), dtype)
+                for name, (offset, shape, dtype) in json.load(f).items()
+            }
+        store._open(truncate=False)
+        return store
+
+    def put(self, name: str, array: np.ndarray) -> np.ndarray:
+        array = np.ascontiguousarray(array)
+        self._own()
+        with self._lock:
+            offset = -(-self._end // ALIGNMENT) * ALIGNMENT
+            self._file.seek(offset)
+            self._file.write(array.data if array.nbytes else b"")
+            self._file.flush()
+            self._end = offset + array.nbytes
+            self.index[name] = (offset, array.shape, array.dtype.str)
+        return self.get(name)
+
+    def get(self, name: str) -> np.ndarray:
+        offset, shape, dtype = self.index[name]
+        if 0 in shape:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    @staticmethod
+    def release(array: np.ndarray) -> None:
+        """
+        Drop the resident pages of a mapped array from this process. The
+        array stays usable and is paged back in from the file on next access.
+        """
+        mapped = getattr(array, "_mmap", None)
+        if mapped is not None and hasattr(mmap, "MADV_DONTNEED"):
+            mapped.madvise(mmap.MADV_DONTNEED)
+
+    def save_index(self) -> None:
+        with open(self._index_path(), "w") as f:
+            json.dump(self.index, f)
+
+    def clear(self) -> None:
+        """
+        Start over on a fresh file, removing a saved index. Maps handed out
+        earlier stay valid, as they keep the unlinked file alive until they
+        are released.
+        """
+        self._own()
+        with self._lock:
+            self._finalizer.detach()
+            self._file.close()
+            self.path.unlink(missing_ok=True)
+            self._index_path().unlink(missing_ok=True)
+            self.index = {}
+            self._open(truncate=True)
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __reduce__(self):
+        return (GlyphStore, ())
+
+    def _own(self) -> None:
+        if self._pid != os.getpid():
+            # Forked: leave the parent's file to the parent. A forked pool
+            # worker clears atexit, so weakref.finalize would not run there.
+            self._finalizer.detach()
+            self._file.close()
+            self.__init__()
+            atexit.register(self.close)
+
+    def _open(self, truncate: bool) -> None:
+        self._file = open(self.path, "w+b" if truncate else "r+b")
+        self._end = self._file.seek(0, os.SEEK_END)
+        self._pid = os.getpid()
+        self._finalizer = weakref.finalize(
+            self, _close_store, self._file, self.path, self._temporary
+        )
+
+    def _index_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".json")
+
+
+def _close_store(file, path: Path, temporary: bool) -> None:
+    file.close()
+    if temporary:
+        path.unlink(missing_ok=True)
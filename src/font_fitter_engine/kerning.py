@@ -0,0 +1,201 @@
+import numpy as np
+
+from font_fitter_engine.algo import Algo
+from font_fitter_engine.algo_sdf.scanline_2_sdf_generator import ScanlineField
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualAreaAlgo,
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.loader import GlyphSpacing
+
+# Pairs are evaluated in chunks of left glyphs of about this many row gaps.
+CHUNK_ELEMENTS = 1 << 24
+# Enough to resolve shifts of up to max_gap to well under a pixel.
+BISECTION_STEPS = 12
+
+
+class SideProfile:
+    """
+    Per-row distance (px) from a glyph's ink bbox to its ink, on the left
+    and on the right. Rows without ink are inf. Every canvas of a font has
+    the same height and baseline, so profiles of different glyphs line up
+    row for row.
+    """
+
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: np.ndarray, right: np.ndarray) -> None:
+        self.left = left
+        self.right = right
+
+    @classmethod
+    def from_ink(cls, ink: np.ndarray) -> "SideProfile":
+        """From an (H, W) or (H, W, C) mask that is True on ink."""
+        if ink.ndim > 2:
+            ink = ink.any(axis=tuple(range(2, ink.ndim)))
+        height, width = ink.shape
+        inked = ink.any(axis=1)
+        first = np.argmax(ink, axis=1).astype(np.float32)
+        last = (width - 1 - np.argmax(ink[:, ::-1], axis=1)).astype(np.float32)
+        left = np.full(height, np.inf, dtype=np.float32)
+        right = np.full(height, np.inf, dtype=np.float32)
+        if inked.any():
+            left[inked] = first[inked] - first[inked].min()
+            right[inked] = last[inked].max() - last[inked]
+        return cls(left, right)
+
+    @classmethod
+    def from_sdf(cls, sdf_array: np.ndarray | ScanlineField) -> "SideProfile":
+        """From an SDF, where ink is negative."""
+        if isinstance(sdf_array, ScanlineField):
+            return cls.from_breakpoints(sdf_array.breakpoints)
+        return cls.from_ink(sdf_array < 0)
+
+    @classmethod
+    def from_breakpoints(cls, breakpoints: np.ndarray) -> "SideProfile":
+        """From ScanlineLoader breakpoints, whose first crossing per row is
+        the leftmost ink and whose last one below the width the rightmost."""
+        width = breakpoints[0, -1]
+        crossings = breakpoints[:, 1:]
+        inked = crossings[:, 0] < width
+        first = np.floor(crossings[:, 0])
+        last = np.ceil(np.where(crossings < width, crossings, 0).max(axis=1)) - 1
+        left = np.full(len(breakpoints), np.inf, dtype=np.float32)
+        right = np.full(len(breakpoints), np.inf, dtype=np.float32)
+        if inked.any():
+            left[inked] = first[inked] - first[inked].min()
+            right[inked] = last[inked].max() - last[inked]
+        return cls(left, right)
+
+
+def gap_area(gaps: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    SDFVisualAreaAlgo of the whitespace between two glyphs from its per-row
+    gaps, taking distances to ink horizontally: a gap g sums to g**2 / 4.
+    It is taken per shared row, so pairs of different heights compare.
+    """
+    return (gaps * gaps).sum(axis=-1) / (4 * np.maximum(rows.sum(axis=-1), 1))
+
+
+def gap_density(gaps: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """SDFVisualDensityAlgo of the same whitespace: its area per pixel."""
+    return (gaps * gaps).sum(axis=-1) / (4 * np.maximum(gaps.sum(axis=-1), 1))
+
+
+PAIR_MEASURES = {
+    SDFVisualAreaAlgo: gap_area,
+    SDFVisualDensityAlgo: gap_density,
+}
+
+
+def sidebearings_from_spacing(
+    spacing: dict[str, GlyphSpacing],
+) -> dict[str, tuple[int, int]]:
+    """(lsb, rsb) from the font metrics, as distances from the ink bbox."""
+    return {
+        glyph: (glyph_spacing.lsb, glyph_spacing.advance - glyph_spacing.xMax)
+        for glyph, glyph_spacing in spacing.items()
+    }
+
+
+class KerningEngine:
+    """
+    Kerns every pair of a glyph set from side profiles, without compositing
+    any pair. A pair's per-row gap is the right profile of the left glyph
+    plus both sidebearings plus the left profile of the right glyph, for
+    all pairs at once. The gap is clipped to [0, max_gap] so open shapes
+    (T, L, counters) do not dominate, and only rows with ink on both sides
+    count.
+
+    Each pair is kerned by the shift that gives its gap the same measure as
+    the `reference` pair (e.g. "HH"), found by vectorized bisection. The
+    measure follows `algo`: SDFVisualAreaAlgo or SDFVisualDensityAlgo
+    applied to the whitespace between the glyphs. Kerns smaller than
+    `min_kern` are dropped. Profiles are sampled every `row_step` rows,
+    which is plenty for kerning and divides the work accordingly.
+    """
+
+    def __init__(
+        self,
+        algo: Algo,
+        reference: str = "H",
+        max_gap: float = 200,
+        min_kern: int = 4,
+        row_step: int = 4,
+    ) -> None:
+        if type(algo) not in PAIR_MEASURES:
+            raise NotImplementedError(f"No pair measure for algo {type(algo).__name__}")
+        self.algo = algo
+        self.measure = PAIR_MEASURES[type(algo)]
+        self.reference = reference
+        self.max_gap = max_gap
+        self.min_kern = min_kern
+        self.row_step = row_step
+
+    def kerning_table(
+        self,
+        profiles: dict[str, SideProfile],
+        sidebearings: dict[str, tuple[int, int]],
+    ) -> dict[tuple[str, str], int]:
+        """Kern per (left, right) pair, in px (font units at 1000 upem)."""
+        glyphs = list(profiles)
+        rows = slice(None, None, self.row_step)
+        lefts = np.stack([profiles[glyph].left[rows] for glyph in glyphs])
+        rights = np.stack([profiles[glyph].right[rows] for glyph in glyphs])
+        lsbs = np.array([sidebearings[glyph][0] for glyph in glyphs], np.float32)
+        rsbs = np.array([sidebearings[glyph][1] for glyph in glyphs], np.float32)
+
+        chunk = max(1, CHUNK_ELEMENTS // (len(glyphs) * lefts.shape[1]))
+        chunks = [
+            (rights[start : start + chunk], rsbs[start : start + chunk], lefts, lsbs)
+            for start in range(0, len(glyphs), chunk)
+        ]
+        if self.reference in profiles:
+            index = glyphs.index(self.reference)
+            target = self._measure(
+                rights[index : index + 1],
+                rsbs[index : index + 1],
+                lefts[index : index + 1],
+                lsbs[index : index + 1],
+                shift=0,
+            )[0, 0]
+        else:
+            # Without the reference glyph the median pair is the reference.
+            target = np.nanmedian(
+                np.concatenate([self._measure(*args, shift=0) for args in chunks])
+            )
+        kerns = np.concatenate([self._solve(args, target) for args in chunks])
+
+        kerns = np.rint(kerns).astype(np.int64)
+        return {
+            (left, right): int(kerns[i, j])
+            for i, left in enumerate(glyphs)
+            for j, right in enumerate(glyphs)
+            if abs(kerns[i, j]) >= self.min_kern
+        }
+
+    def _measure(self, rights, rsbs, lefts, lsbs, shift) -> np.ndarray:
+        """Measure of every (left, right) pair after moving them by shift."""
+        gaps = (
+            rights[:, None, :]
+            + lefts[None, :, :]
+            + (rsbs[:, None] + lsbs[None, :] + shift)[:, :, None]
+        )
+        rows = np.isfinite(gaps)
+        gaps = np.clip(np.where(rows, gaps, 0), 0, self.max_gap)
+        return np.where(rows.any(axis=-1), self.measure(gaps, rows), np.nan)
+
+    def _solve(self, args, target) -> np.ndarray:
+        """Shift per pair bringing its measure to target, by bisection. Both
+        measures grow with the shift; pairs without shared rows get 0."""
+        pairs = (len(args[0]), len(args[2]))
+        low = np.full(pairs, -self.max_gap, dtype=np.float32)
+        high = np.full(pairs, self.max_gap, dtype=np.float32)
+        for _ in range(BISECTION_STEPS):
+            middle = (low + high) / 2
+            below = self._measure(*args, shift=middle) < target
+            low = np.where(below, middle, low)
+            high = np.where(below, high, middle)
+        shift = (low + high) / 2
+        shared = np.isfinite(self._measure(*args, shift=0))
+        return np.where(shared, shift, 0)
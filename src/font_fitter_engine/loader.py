@@ -1,15 +1,29 @@
 from fontTools import ttLib
 from pathlib import Path
 from fontTools.pens import freetypePen
+from fontTools.pens.boundsPen import ControlBoundsPen
+from fontTools.pens.recordingPen import DecomposingRecordingPen
+from fontTools.pens.roundingPen import RoundingPen
+from fontTools.pens.transformPen import TransformPen
 from fontTools.ttLib.tables._c_m_a_p import table__c_m_a_p
 from fontTools.ttLib.tables._h_m_t_x import table__h_m_t_x
 from fontTools.ttLib.tables._g_l_y_f import table__g_l_y_f
 from fontTools.ttLib.tables._h_h_e_a import table__h_h_e_a
 from fontTools.ttLib.scaleUpem import scale_upem
+from fontTools.misc.fixedTools import otRound
+import copy
+import hashlib
 import numpy as np
 from PIL import Image
 
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass, fields
+from font_fitter_engine.artifacts import NULL_ARTIFACTS, ArtifactLevel, ArtifactWriter
+from font_fitter_engine.disk_cache import DiskCache
+from font_fitter_engine.glyph_store import GlyphStore
+from font_fitter_engine.parallel import thread_map
+from font_fitter_engine.tracing import NULL_TRACER, Tracer
+
+SPACE = 400
 
 
 @dataclass
@@ -34,6 +48,102 @@ class ImgOut:
         int,
         int,
     ]  # x1,y1
+    cache_key: str | None = None  # content key of the raster, when disk cached
+    canvas_width: int | None = None  # when array is not laid out as the canvas
+
+    @property
+    def canvas_shape(self) -> tuple[int, int]:
+        height, width = self.array.shape[:2]
+        return height, width if self.canvas_width is None else self.canvas_width
+
+
+class ScaledGlyphSet:
+    """
+    Glyph set of a (lazily loaded) TTFont whose glyf outlines are scaled by
+    factor when drawn, exactly as scale_upem would scale them: coordinates,
+    bboxes and component offsets are rounded with otRound. Only the glyphs
+    drawn, and their components, are decompiled and scaled.
+    """
+
+    def __init__(self, ttfont: ttLib.TTFont, factor: float) -> None:
+        self.glyf: table__g_l_y_f = ttfont["glyf"]
+        self.factor = factor
+        self._glyphs: dict[str, "_ScaledGlyph"] = {}
+
+    def __getitem__(self, name: str) -> "_ScaledGlyph":
+        if name not in self._glyphs:
+            self._glyphs[name] = _ScaledGlyph(self._scale(self.glyf[name]), self.glyf)
+        return self._glyphs[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.glyf
+
+    def _scale(self, glyph):
+        glyph = copy.deepcopy(glyph)
+        for attr in ("xMin", "xMax", "yMin", "yMax"):
+            value = getattr(glyph, attr, None)
+            if value is not None:
+                setattr(glyph, attr, otRound(value * self.factor))
+        if glyph.isComposite():
+            for component in glyph.components:
+                component.x = otRound(component.x * self.factor)
+                component.y = otRound(component.y * self.factor)
+        elif hasattr(glyph, "coordinates"):
+            glyph.coordinates.scale((self.factor, self.factor))
+            glyph.coordinates.toInt(round=otRound)
+        return glyph
+
+
+class _ScaledGlyph:
+    def __init__(self, glyph, glyf: table__g_l_y_f) -> None:
+        self.glyph = glyph
+        self.glyf = glyf
+
+    def draw(self, pen) -> None:
+        # Components are resolved by the pen through its glyphSet.
+        self.glyph.draw(pen, self.glyf)
+
+
+class InstanceGlyphSet:
+    """
+    Glyph set of a variable font at `location`, in user-space axis
+    coordinates (e.g. {"wght": 700}). gvar and HVAR are applied per glyph
+    as it is drawn, so only the glyphs fitted are instanced. Outlines are
+    decomposed and rounded to integers as varLib.instancer does, then
+    scaled by factor like ScaledGlyphSet; advances (`width`) are scaled too.
+    """
+
+    def __init__(
+        self, ttfont: ttLib.TTFont, location: dict[str, float], factor: float
+    ) -> None:
+        self.glyphs = ttfont.getGlyphSet(location=location)
+        self.factor = factor
+
+    def __getitem__(self, name: str) -> "_InstanceGlyph":
+        return _InstanceGlyph(self, name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.glyphs
+
+
+class _InstanceGlyph:
+    def __init__(self, glyph_set: InstanceGlyphSet, name: str) -> None:
+        self.glyph_set = glyph_set
+        self.name = name
+
+    @property
+    def width(self) -> float:
+        return self.glyph_set.glyphs[self.name].width * self.glyph_set.factor
+
+    def draw(self, pen) -> None:
+        recording = DecomposingRecordingPen(self.glyph_set.glyphs)
+        self.glyph_set.glyphs[self.name].draw(recording)
+        factor = self.glyph_set.factor
+        if factor != 1.0:
+            pen = TransformPen(
+                RoundingPen(pen, roundFunc=otRound), (factor, 0, 0, factor, 0, 0)
+            )
+        recording.replay(RoundingPen(pen, roundFunc=otRound))
 
 
 class Loader:
@@ -41,9 +151,22 @@ class Loader:
         self,
         glyph_set: list[str],
         save_dir: str | None = None,
+        threads: int = 1,
+        tracer: Tracer | None = None,
+        artifacts: ArtifactWriter | None = None,
     ) -> None:
+        """
+        artifacts writes the glyph rasters in the background, at
+        ArtifactLevel.RASTERS and up. A save_dir without artifacts writes
+        the rasters there.
+        """
         self.glyph_set = glyph_set
         self.save_dir = save_dir
+        self.threads = threads
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        if artifacts is None and save_dir is not None:
+            artifacts = ArtifactWriter(save_dir, level=ArtifactLevel.RASTERS)
+        self.artifacts = artifacts if artifacts is not None else NULL_ARTIFACTS
         pass
 
     def process(self) -> dict[str, ImgOut]:
@@ -55,63 +178,276 @@ class Loader:
     def get_spacing(self) -> dict[str, GlyphSpacing]:
         raise NotImplementedError
 
+    def glyph_hashes(self) -> dict[str, str]:
+        """
+        Digest per glyph of the glyph set of everything its raster depends
+        on, so a glyph whose digest is unchanged needs no refitting.
+        """
+        raise NotImplementedError
+
+    def cache_key(self) -> tuple:
+        """Identifies the loader config that rasters depend on."""
+        return (type(self).__name__,)
+
+    def named_instances(self, path: Path) -> list[dict[str, float]] | None:
+        """
+        Locations of the named instances of the font at path, or None when
+        it is not a variable font.
+        """
+        return None
+
+    def cmap_glyphs(self) -> list[str]:
+        """Every character of the loaded font that has an outline to fit."""
+        raise NotImplementedError
+
 
 class TTF_Loader(Loader):
-    def __init__(self, glyph_set, save_dir) -> None:
+    def __init__(
+        self,
+        glyph_set,
+        save_dir,
+        threads: int = 1,
+        cache: DiskCache | None = None,
+        store: GlyphStore | None = None,
+        tracer: Tracer | None = None,
+        grayscale: bool = False,
+        lazy: bool = False,
+        artifacts: ArtifactWriter | None = None,
+    ) -> None:
+        """
+        threads > 1 rasterises and normalizes glyphs on a thread pool.
+        cache keeps rasters and spacing on disk, keyed by the font file hash,
+        so an unchanged font is not parsed or rasterised again.
+        store moves each raster into a memory-mapped GlyphStore as soon as it
+        is made, so memory use does not grow with the glyph count.
+        tracer records a span per loading stage.
+        grayscale places the FreeType coverage straight into a 2-D float32
+        canvas (1.0 background, 0.0 ink) instead of compositing RGBA images
+        with PIL. It is a quarter of the memory and the SDF is computed on
+        one plane, so window sums are per pixel rather than over 4 channels.
+        lazy opens the font with lazy table access instead of running
+        scale_upem over the whole font, so only cmap, hmtx, hhea and the
+        glyf entries of glyph_set are decompiled; those glyphs and metrics
+        are scaled on the fly, with the same rounding as scale_upem.
+
+        A variable font is loaded at its default location unless `load` is
+        given another one. Instances of the same font file share the parsed
+        font, so its default master tables are decompiled once.
+        """
         self.ttf_font = None
-        super().__init__(glyph_set=glyph_set, save_dir=save_dir)
+        self.path: Path | None = None
+        self.scale = 1000
+        self.font_hash: str | None = None
+        self.cache = cache
+        self.store = store
+        self.grayscale = grayscale
+        self.lazy = lazy
+        self.location: dict[str, float] | None = None
+        self._mtime: int | None = None
+        self._glyph_set = None
+        self._upem_factor = 1.0
+        super().__init__(
+            glyph_set=glyph_set,
+            save_dir=save_dir,
+            threads=threads,
+            tracer=tracer,
+            artifacts=artifacts,
+        )
 
     def process(
         self,
     ) -> dict[str, ImgOut]:
-        if self.ttf_font is None:
+        if self.path is None:
             raise ValueError("Not Loaded yet.")
-        imgs = self.rasterise(ttfont=self.ttf_font, glyph_set=self.glyph_set)
-        spacing = self.get_spacing()
-        normalized_imgs = self.normalize(imgs, spacing)
-        self.save(imgs=normalized_imgs, save_dir=self.save_dir)
+        imgs_array = {}
+        if self.cache is not None:
+            with self.tracer.span("cache_lookup", category="loader"):
+                for glyph in self.glyph_set:
+                    key = self._raster_key(glyph)
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        imgs_array[glyph] = ImgOut(
+                            array=self._keep(glyph, cached["array"]),
+                            center_x=int(cached["center_x"]),
+                            height=int(cached["height"]),
+                            glyph_size=tuple(cached["glyph_size"].tolist()),
+                            cache_key=key,
+                        )
 
-        imgs_array = {
+        missing = [glyph for glyph in self.glyph_set if glyph not in imgs_array]
+        if missing:
+            spacing = self.get_spacing()
+            # With a store only a few rasters are in memory at any time.
+            batch_size = len(missing) if self.store is None else max(1, self.threads)
+            for start in range(0, len(missing), batch_size):
+                imgs_array.update(
+                    self._process_glyphs(missing[start : start + batch_size], spacing)
+                )
+        return {glyph: imgs_array[glyph] for glyph in self.glyph_set}
+
+    def _process_glyphs(
+        self, glyph_set: list[str], spacing: dict[str, GlyphSpacing]
+    ) -> dict[str, ImgOut]:
+        if self.grayscale:
+            imgs_array = self._process_grayscale(glyph_set, spacing)
+        else:
+            imgs_array = self._process_rgba(glyph_set, spacing)
+        if self.cache is not None:
+            for glyph, img_out in imgs_array.items():
+                img_out.cache_key = self._raster_key(glyph)
+                self.cache.put(
+                    img_out.cache_key,
+                    {
+                        "array": img_out.array,
+                        "center_x": np.array(img_out.center_x),
+                        "height": np.array(img_out.height),
+                        "glyph_size": np.array(img_out.glyph_size),
+                    },
+                )
+        return imgs_array
+
+    def _process_rgba(
+        self, glyph_set: list[str], spacing: dict[str, GlyphSpacing]
+    ) -> dict[str, ImgOut]:
+        ttfont = self._font()
+        with self.tracer.span("rasterise", category="loader", glyphs=len(glyph_set)):
+            names = self._glyph_names(glyph_set)
+            by_name = self.rasterise(
+                ttfont=ttfont,
+                glyph_set=names,
+                threads=self.threads,
+                glyphs=self._glyphs(),
+            )
+            imgs = {glyph: by_name[name] for glyph, name in zip(glyph_set, names)}
+        with self.tracer.span("normalize", category="loader", glyphs=len(glyph_set)):
+            normalized_imgs = self.normalize(imgs, spacing, threads=self.threads)
+        if self.artifacts.wants(ArtifactLevel.RASTERS):
+            with self.tracer.span("save", category="loader", glyphs=len(glyph_set)):
+                for glyph, img in normalized_imgs.items():
+                    self.artifacts.raster(glyph, img)
+
+        with self.tracer.span("to_array", category="loader", glyphs=len(glyph_set)):
+            arrays = thread_map(
+                np.array, normalized_imgs.values(), threads=self.threads
+            )
+        return {
             glyph: ImgOut(
-                array=np.array(img),
+                array=self._keep(glyph, array),
                 center_x=imgs[glyph].width // 2,
                 height=imgs[glyph].height,
                 glyph_size=imgs[glyph].size,
             )
-            for glyph, img in normalized_imgs.items()
+            for glyph, array in zip(normalized_imgs, arrays)
         }
+
+    def _process_grayscale(
+        self, glyph_set: list[str], spacing: dict[str, GlyphSpacing]
+    ) -> dict[str, ImgOut]:
+        ttfont = self._font()
+        with self.tracer.span("rasterise", category="loader", glyphs=len(glyph_set)):
+            names = self._glyph_names(glyph_set)
+            by_name = self.rasterise_coverage(
+                ttfont=ttfont,
+                glyph_set=names,
+                threads=self.threads,
+                glyphs=self._glyphs(),
+            )
+            coverages = {glyph: by_name[name] for glyph, name in zip(glyph_set, names)}
+        with self.tracer.span("normalize", category="loader", glyphs=len(glyph_set)):
+            canvases = thread_map(
+                lambda glyph: self._place_coverage(coverages[glyph], spacing[glyph]),
+                glyph_set,
+                threads=self.threads,
+            )
+        if self.artifacts.wants(ArtifactLevel.RASTERS):
+            # Encoded to 8 bit PNGs on the artifact writer's thread.
+            with self.tracer.span("save", category="loader", glyphs=len(glyph_set)):
+                for glyph, canvas in zip(glyph_set, canvases):
+                    self.artifacts.raster(glyph, canvas)
+        imgs_array = {}
+        for glyph, canvas in zip(glyph_set, canvases):
+            height, width = coverages[glyph].shape
+            imgs_array[glyph] = ImgOut(
+                array=self._keep(glyph, canvas),
+                center_x=width // 2,
+                height=height,
+                glyph_size=(width, height),
+            )
         return imgs_array
 
+    def _keep(self, glyph: str, array: np.ndarray) -> np.ndarray:
+        if self.store is None:
+            return array
+        return self.store.put(f"raster/{glyph}", array)
+
     def get_spacing(
         self,
     ):
-        if self.ttf_font is None:
+        if self.path is None:
             raise ValueError("Not Loaded yet.")
+        with self.tracer.span("spacing", category="loader"):
+            return self._get_spacing()
+
+    def _get_spacing(self) -> dict[str, GlyphSpacing]:
+        if self.cache is None:
+            return self._read_spacing()
+
+        key = self.cache.key(
+            "spacing",
+            self.font_hash,
+            self.scale,
+            self._location_key(),
+            tuple(self.glyph_set),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {
+                glyph: GlyphSpacing(*row)
+                for glyph, row in zip(self.glyph_set, cached["spacing"].tolist())
+            }
+        glyph_spacing = self._read_spacing()
+        self.cache.put(
+            key,
+            {
+                "spacing": np.array(
+                    [astuple(glyph_spacing[glyph]) for glyph in self.glyph_set],
+                    dtype=np.int64,
+                ).reshape(-1, len(fields(GlyphSpacing)))
+            },
+        )
+        return glyph_spacing
+
+    def _read_spacing(self) -> dict[str, GlyphSpacing]:
+        if self.location is not None:
+            return self._read_instance_spacing()
+        ttf_font = self._font()
         glyph_codes = [ord(i) for i in self.glyph_set]
-        cmap: table__c_m_a_p = self.ttf_font.getBestCmap()
-        hmtx: table__h_m_t_x = self.ttf_font.get("hmtx", None)
-        hhea: table__h_h_e_a = self.ttf_font.get("hhea", None)
-        glyf: table__g_l_y_f = self.ttf_font.get("glyf", None)
+        cmap: table__c_m_a_p = ttf_font.getBestCmap()
+        hmtx: table__h_m_t_x = ttf_font.get("hmtx", None)
+        hhea: table__h_h_e_a = ttf_font.get("hhea", None)
+        glyf: table__g_l_y_f = ttf_font.get("glyf", None)
         glyph_spacing: dict[str, GlyphSpacing] = {}
 
+        units = self._units
+
         for glyph_code in glyph_codes:
             glyph_name = cmap[glyph_code]
-            advance, lsb = hmtx[glyph_name]
+            advance, lsb = (units(value) for value in hmtx[glyph_name])
             xMin = 0
             yMin = 0
             xMax = 0
             yMax = 0
             rsb = 0
-            ascent = hhea.ascent
-            descent = hhea.descent
+            ascent = units(hhea.ascent)
+            descent = units(hhea.descent)
             if glyf.get(glyph_name, None) is None:
                 pass
-            elif glyf[glyph_name].numberOfContours > 0:
-                xMin = glyf[glyph_name].xMin
-                yMin = glyf[glyph_name].yMin
-                xMax = glyf[glyph_name].xMax
-                yMax = glyf[glyph_name].yMax
-                rsb = glyf[glyph_name].xMax - advance
+            elif glyf[glyph_name].numberOfContours != 0:
+                xMin = units(glyf[glyph_name].xMin)
+                yMin = units(glyf[glyph_name].yMin)
+                xMax = units(glyf[glyph_name].xMax)
+                yMax = units(glyf[glyph_name].yMax)
+                rsb = xMax - advance
 
             glyph_spacing[chr(glyph_code)] = GlyphSpacing(
                 advance=advance,
@@ -127,28 +463,241 @@ class TTF_Loader(Loader):
 
         return glyph_spacing
 
-    def load(self, path: str, scale: int = 1000) -> None:
+    def _read_instance_spacing(self) -> dict[str, GlyphSpacing]:
+        """
+        Like _read_spacing at self.location: advances include HVAR, and
+        bboxes are the control bounds of the instanced outlines, as glyf
+        stores them, so lsb is xMin.
+        Vertical metrics stay those of the default master, keeping canvases
+        of every instance the same height.
+        """
+        hhea: table__h_h_e_a = self._font()["hhea"]
+        glyphs = self._glyphs()
+        glyph_spacing: dict[str, GlyphSpacing] = {}
+
+        for glyph, glyph_name in zip(self.glyph_set, self._glyph_names(self.glyph_set)):
+            pen = ControlBoundsPen(None)
+            glyphs[glyph_name].draw(pen)
+            advance = otRound(glyphs[glyph_name].width)
+            xMin, yMin, xMax, yMax = (
+                (0, 0, 0, 0) if pen.bounds is None else map(otRound, pen.bounds)
+            )
+            glyph_spacing[glyph] = GlyphSpacing(
+                advance=advance,
+                lsb=xMin,
+                rsb=0 if pen.bounds is None else xMax - advance,
+                xMin=xMin,
+                yMin=yMin,
+                xMax=xMax,
+                yMax=yMax,
+                ascent=self._units(hhea.ascent),
+                descent=self._units(hhea.descent),
+            )
+
+        return glyph_spacing
+
+    def glyph_hashes(self) -> dict[str, str]:
+        """
+        Hashes each glyph's outline as drawn, decomposed at the loaded scale
+        and location, together with its spacing. Editing a component thus
+        changes the hash of every glyph using it.
+        """
+        glyphs = self._glyphs()
+        spacing = self.get_spacing()
+        hashes = {}
+        for glyph, glyph_name in zip(self.glyph_set, self._glyph_names(self.glyph_set)):
+            pen = DecomposingRecordingPen(glyphs)
+            glyphs[glyph_name].draw(pen)
+            digest = hashlib.sha256(repr(pen.value).encode())
+            digest.update(repr(astuple(spacing[glyph])).encode())
+            hashes[glyph] = digest.hexdigest()
+        return hashes
+
+    def cache_key(self) -> tuple:
+        return (type(self).__name__, self.scale, SPACE, self.grayscale)
+
+    def named_instances(self, path: Path) -> list[dict[str, float]] | None:
+        ttfont = ttLib.TTFont(path, lazy=True)
+        if "fvar" not in ttfont:
+            return None
+        return [dict(instance.coordinates) for instance in ttfont["fvar"].instances]
+
+    def cmap_glyphs(self) -> list[str]:
+        """
+        Every character of the font's best cmap whose glyph has an outline,
+        simple or composite, in code point order. Blank glyphs (space,
+        controls) have nothing to fit and are left out.
+        """
+        if self.path is None:
+            raise ValueError("Not Loaded yet.")
+        if self.cache is None:
+            return self._read_cmap_glyphs()
+        key = self.cache.key("cmap", self.font_hash)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return [chr(code) for code in cached["codes"].tolist()]
+        glyphs = self._read_cmap_glyphs()
+        self.cache.put(
+            key, {"codes": np.array([ord(glyph) for glyph in glyphs], dtype=np.int64)}
+        )
+        return glyphs
+
+    def _read_cmap_glyphs(self) -> list[str]:
+        ttf_font = self._font()
+        glyf: table__g_l_y_f = ttf_font["glyf"]
+        return [
+            chr(code)
+            for code, glyph_name in sorted(ttf_font.getBestCmap().items())
+            if glyph_name in glyf and glyf[glyph_name].numberOfContours != 0
+        ]
+
+    def _glyph_names(self, glyph_set: list[str]) -> list[str]:
+        """glyf names of the characters of glyph_set."""
+        cmap = self._font().getBestCmap()
+        return [cmap[ord(glyph)] for glyph in glyph_set]
+
+    def load(
+        self, path: str, scale: int = 1000, location: dict[str, float] | None = None
+    ) -> None:
+        """
+        location is the variable font instance to load, in user-space axis
+        coordinates. Reloading the same unchanged file at the same scale
+        keeps the parsed font and only switches instance.
+        """
         path_b = Path(path)
-        self.ttf_font = ttLib.TTFont(path_b)
-        scale_upem(self.ttf_font, scale)
+        mtime = path_b.stat().st_mtime_ns
+        same_font = (path_b, scale, mtime) == (self.path, self.scale, self._mtime)
+        self.path = path_b
+        self.scale = scale
+        self.location = location
+        self._mtime = mtime
+        self._glyph_set = None
+        if self.store is not None:
+            self.store.clear()
+        if same_font and (self.ttf_font is not None or self.font_hash is not None):
+            return
+        self.ttf_font = None
+        if self.cache is None:
+            self._font()
+        else:
+            # Parsing is deferred until a cache miss actually needs the font.
+            with self.tracer.span("hash", category="loader", font=path_b.name):
+                self.font_hash = self.cache.hash_file(path_b)
+
+    def _font(self) -> ttLib.TTFont:
+        if self.ttf_font is None:
+            if self.path is None:
+                raise ValueError("Not Loaded yet.")
+            with self.tracer.span("parse", category="loader", font=self.path.name):
+                if self.lazy:
+                    self.ttf_font = ttLib.TTFont(self.path, lazy=True)
+                    self._upem_factor = self.scale / self.ttf_font["head"].unitsPerEm
+                else:
+                    self.ttf_font = ttLib.TTFont(self.path)
+                    scale_upem(self.ttf_font, self.scale)
+                    self._upem_factor = 1.0
+        return self.ttf_font
+
+    def _glyphs(self):
+        """Glyph set to draw outlines from, at the loaded scale."""
+        if self._glyph_set is None:
+            ttfont = self._font()
+            if self.location is not None:
+                self._glyph_set = InstanceGlyphSet(
+                    ttfont, self.location, self._upem_factor
+                )
+            elif self.lazy:
+                self._glyph_set = ScaledGlyphSet(ttfont, self._upem_factor)
+            else:
+                self._glyph_set = ttfont.getGlyphSet()
+        return self._glyph_set
+
+    def _units(self, value: int) -> int:
+        """A metric of the font in units of the loaded scale."""
+        if self._upem_factor == 1.0:
+            return value
+        return otRound(value * self._upem_factor)
+
+    def _location_key(self) -> tuple | None:
+        if self.location is None:
+            return None
+        return tuple(sorted(self.location.items()))
+
+    def _raster_key(self, glyph: str) -> str:
+        return self.cache.key(
+            "raster",
+            type(self).__name__,
+            self.font_hash,
+            self.scale,
+            self._location_key(),
+            SPACE,
+            self.grayscale,
+            glyph,
+        )
 
     @classmethod
-    def save(cls, imgs: dict[str, Image.Image], save_dir: str | None = "outputs/"):
-        if save_dir is None:
-            return
-        for glyph, img in imgs.items():
-            fmt = "png"
-            img.save(fp=save_dir + f"{glyph}.{fmt}", format=fmt)
+    def rasterise(
+        cls, ttfont: ttLib.TTFont, glyph_set, threads: int = 1, glyphs=None
+    ) -> dict[str, Image.Image]:
+        """glyphs is the glyph set outlines are drawn from, by default
+        ttfont.getGlyphSet()."""
+        # Outlines are drawn serially as fontTools decompiles tables lazily and
+        # is not thread safe; only the FreeType rendering is spread on threads.
+        pens = []
+        full_glyph_set = ttfont.getGlyphSet() if glyphs is None else glyphs
+        for glyph in glyph_set:
+            pen = freetypePen.FreeTypePen(glyphSet=full_glyph_set)
+            full_glyph_set[glyph].draw(pen=pen)
+            pens.append(pen)
+        images = thread_map(lambda pen: pen.image(), pens, threads=threads)
+        return dict(zip(glyph_set, images))
 
     @classmethod
-    def rasterise(cls, ttfont: ttLib.TTFont, glyph_set) -> dict[str, Image.Image]:
-        images = {}
-        full_glyph_set = ttfont.getGlyphSet()
+    def rasterise_coverage(
+        cls, ttfont: ttLib.TTFont, glyph_set, threads: int = 1, glyphs=None
+    ) -> dict[str, np.ndarray]:
+        """
+        Like rasterise, but returns each glyph's 8-bit FreeType coverage as a
+        (height, width) uint8 array viewing the rendered buffer, without PIL.
+        """
+        pens = []
+        full_glyph_set = ttfont.getGlyphSet() if glyphs is None else glyphs
         for glyph in glyph_set:
-            pen = freetypePen.FreeTypePen(glyphSet=None)
+            pen = freetypePen.FreeTypePen(glyphSet=full_glyph_set)
             full_glyph_set[glyph].draw(pen=pen)
-            images[glyph] = pen.image()
-        return images
+            pens.append(pen)
+
+        def coverage(pen: freetypePen.FreeTypePen) -> np.ndarray:
+            buffer, (width, height) = pen.buffer()
+            return np.frombuffer(buffer, dtype=np.uint8).reshape(height, width)
+
+        return dict(zip(glyph_set, thread_map(coverage, pens, threads=threads)))
+
+    @staticmethod
+    def _place_coverage(
+        coverage: np.ndarray, glyph_spacing: GlyphSpacing
+    ) -> np.ndarray:
+        """
+        Writes coverage into a preallocated float32 canvas laid out like
+        _normalize_glyph, as 1.0 - coverage / 255 so background is 1.0.
+        """
+        height, width = coverage.shape
+        canvas = np.ones(
+            (glyph_spacing.ascent - glyph_spacing.descent, width + SPACE * 2),
+            dtype=np.float32,
+        )
+        top = glyph_spacing.ascent - glyph_spacing.yMax
+        # Rows outside the canvas are clipped, as Image.paste does.
+        src_top = max(0, -top)
+        dst_top = max(0, top)
+        rows = min(height - src_top, canvas.shape[0] - dst_top)
+        if rows > 0:
+            region = canvas[dst_top : dst_top + rows, SPACE : SPACE + width]
+            np.multiply(
+                coverage[src_top : src_top + rows], np.float32(-1 / 255), out=region
+            )
+            region += 1
+        return canvas
 
     @staticmethod
     def grayscale_to_color(image: Image.Image, new_color=(255, 255, 255)):
@@ -157,26 +706,35 @@ class TTF_Loader(Loader):
         return new_image
 
     @classmethod
-    def normalize(cls, imgs: dict[str, Image.Image], spacing: dict[str, GlyphSpacing]):
+    def normalize(
+        cls,
+        imgs: dict[str, Image.Image],
+        spacing: dict[str, GlyphSpacing],
+        threads: int = 1,
+    ):
         """
         Height is  ascent + descent
         Width is width of glyph + 2x space left and right
         """
-        SPACE = 400
-        new_imgs = {}
-        for glyph, img in imgs.items():
-            img = cls.grayscale_to_color(img, (255, 255, 255))
-            new_canvas = Image.new(
-                mode="RGBA",
-                size=(
-                    img.width + SPACE * 2,
-                    spacing[glyph].ascent - spacing[glyph].descent,
-                ),
-                color=(255, 255, 255),
-            )
+        new_imgs = thread_map(
+            lambda glyph: cls._normalize_glyph(imgs[glyph], spacing[glyph]),
+            imgs,
+            threads=threads,
+        )
+        return dict(zip(imgs, new_imgs))
 
-            new_canvas.paste(img, (SPACE, spacing[glyph].ascent - spacing[glyph].yMax))
+    @classmethod
+    def _normalize_glyph(cls, img: Image.Image, glyph_spacing: GlyphSpacing):
+        img = cls.grayscale_to_color(img, (255, 255, 255))
+        new_canvas = Image.new(
+            mode="RGBA",
+            size=(
+                img.width + SPACE * 2,
+                glyph_spacing.ascent - glyph_spacing.descent,
+            ),
+            color=(255, 255, 255),
+        )
 
-            new_imgs[glyph] = new_canvas
+        new_canvas.paste(img, (SPACE, glyph_spacing.ascent - glyph_spacing.yMax))
 
-        return new_imgs
+        return new_canvas
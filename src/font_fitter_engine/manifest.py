@@ -0,0 +1,57 @@
+import json
+import os
+from pathlib import Path
+
+from font_fitter_engine.results import _to_json
+
+
+class Manifest:
+    """
+    What a font (instance) was last fitted from, and the records fitted.
+    Keeps a hash of the pipeline config, and per glyph the hash of its
+    outline and metrics (Loader.glyph_hashes) with its records. A glyph
+    whose hash is unchanged under the same config reuses its records;
+    a changed config invalidates every glyph.
+
+    Stored as one JSON file, written atomically on `save`.
+    """
+
+    def __init__(self, path: str | Path, config: str) -> None:
+        self.path = Path(path)
+        self.config = config
+        self.glyphs: dict[str, dict] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            # Unreadable manifest, refit everything.
+            return
+        if stored.get("config") == config:
+            self.glyphs = stored.get("glyphs", {})
+
+    def get(self, glyph: str, glyph_hash: str) -> list[dict] | None:
+        """The glyph's records, when it was fitted from the same hash."""
+        entry = self.glyphs.get(glyph)
+        if entry is None or entry["hash"] != glyph_hash:
+            return None
+        return entry["records"]
+
+    def put(self, glyph: str, glyph_hash: str, records: list[dict]) -> None:
+        self.glyphs[glyph] = {"hash": glyph_hash, "records": records}
+
+    def save(self, glyphs: list[str] | None = None) -> None:
+        """Write the manifest, keeping only `glyphs` when given, so glyphs
+        removed from the font do not linger."""
+        if glyphs is not None:
+            self.glyphs = {
+                glyph: self.glyphs[glyph] for glyph in glyphs if glyph in self.glyphs
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"config": self.config, "glyphs": self.glyphs}, f, default=_to_json
+            )
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from font_fitter_engine.disk_cache import DiskCache
+
+DEFAULT_MAX_BYTES = 1024**3
+
+
+class MemoryCache:
+    """
+    In-memory stand-in for DiskCache, with the same key/get/put interface,
+    so a long-running process (see FittingServer) keeps rasters, spacing
+    and SDFs of the fonts it has seen warm. Entries are evicted least
+    recently used first once they hold more than `max_bytes` of arrays.
+
+    Arrays are stored and returned as is, not copied, so a hit returns the
+    very array a TransformCache entry was keyed on and hits there too.
+    """
+
+    key = staticmethod(DiskCache.key)
+    hash_file = staticmethod(DiskCache.hash_file)
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, dict[str, np.ndarray]] = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        with self._lock:
+            arrays = self._entries.get(key, None)
+            if arrays is not None:
+                self._entries.move_to_end(key)
+            return arrays
+
+    def put(self, key: str, arrays: dict[str, np.ndarray]) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= _nbytes(previous)
+            self._entries[key] = arrays
+            self._size += _nbytes(arrays)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= _nbytes(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        # Entries are per process; a pickled cache (e.g. sent to a worker)
+        # starts empty.
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        state["_size"] = 0
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+
+def _nbytes(arrays: dict[str, np.ndarray]) -> int:
+    return sum(np.asarray(array).nbytes for array in arrays.values())
@@ -0,0 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def thread_map(fn: Callable[[T], R], items: Iterable[T], threads: int = 1) -> list[R]:
+    """
+    Ordered map over `items`, run on a thread pool when `threads` > 1.
+    Only worth it for work that releases the GIL (FreeType, PIL, scipy).
+    """
+    if threads <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(fn, items))
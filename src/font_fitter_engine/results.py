@@ -0,0 +1,137 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_BUFFER_SIZE = 64
+
+
+class StepTrace:
+    """Every step a searcher evaluated on one side, as parallel arrays."""
+
+    __slots__ = ("widths", "densities", "density_diffs")
+
+    def __init__(
+        self, widths: np.ndarray, densities: np.ndarray, density_diffs: np.ndarray
+    ) -> None:
+        self.widths = widths
+        self.densities = densities
+        self.density_diffs = density_diffs
+
+    def __len__(self) -> int:
+        return len(self.widths)
+
+    def to_dict(self) -> dict:
+        return {
+            "widths": self.widths.tolist(),
+            "densities": self.densities.tolist(),
+            "density_diffs": self.density_diffs.tolist(),
+        }
+
+
+class SearchResult:
+    """
+    Outcome of one glyph, algo and target density search. The step traces
+    are only kept when the searcher was asked to trace.
+    """
+
+    __slots__ = (
+        "lsb",
+        "optimal_area_left",
+        "optimal_area_right",
+        "left_density_diff",
+        "right_density_diff",
+        "left_achieved_density",
+        "right_achieved_density",
+        "left_trace",
+        "right_trace",
+    )
+
+    def __init__(
+        self,
+        lsb: int,
+        optimal_area_left: tuple[int, int, int, int],
+        optimal_area_right: tuple[int, int, int, int],
+        left_density_diff: float,
+        right_density_diff: float,
+        left_achieved_density: float,
+        right_achieved_density: float,
+        left_trace: StepTrace | None = None,
+        right_trace: StepTrace | None = None,
+    ) -> None:
+        self.lsb = lsb
+        self.optimal_area_left = optimal_area_left
+        self.optimal_area_right = optimal_area_right
+        self.left_density_diff = left_density_diff
+        self.right_density_diff = right_density_diff
+        self.left_achieved_density = left_achieved_density
+        self.right_achieved_density = right_achieved_density
+        self.left_trace = left_trace
+        self.right_trace = right_trace
+
+    def to_dict(self) -> dict:
+        record = {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if not name.endswith("_trace")
+        }
+        if self.left_trace is not None:
+            record["left_trace"] = self.left_trace.to_dict()
+        if self.right_trace is not None:
+            record["right_trace"] = self.right_trace.to_dict()
+        return record
+
+    def __repr__(self) -> str:
+        return f"SearchResult({self.to_dict()!r})"
+
+
+class JSONLWriter:
+    """
+    Writes result records as JSON lines (NDJSON). Records are buffered and
+    written out every `buffer_size` records, on flush() and on close(), so
+    downstream tools can tail the file while a run is in progress. A path
+    of "-" writes to stdout, which is flushed but left open on close().
+    """
+
+    def __init__(self, path: str | Path, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self._buffer: list[str] = []
+        if str(path) == "-":
+            self._file = sys.stdout
+            self._owns_file = False
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._owns_file = True
+
+    def write(self, record: dict) -> None:
+        self._buffer.append(json.dumps(record, default=_to_json))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            if self._owns_file:
+                self._file.close()
+
+    def __enter__(self) -> "JSONLWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,161 @@
+import math
+
+import numpy as np
+from fontTools import ttLib
+from fontTools.pens.basePen import BasePen
+
+from font_fitter_engine.loader import SPACE, GlyphSpacing, ImgOut, TTF_Loader
+from font_fitter_engine.parallel import thread_map
+
+# Largest distance (px) between a flattened curve and its chords.
+FLATNESS = 0.2
+
+
+class FlatteningPen(BasePen):
+    """Collects a glyph outline as straight edges (x0, y0, x1, y1), with
+    quadratic and cubic curves flattened to within FLATNESS."""
+
+    def __init__(self, glyphSet=None, flatness: float = FLATNESS) -> None:
+        super().__init__(glyphSet)
+        self.flatness = flatness
+        self.edges: list[tuple[float, float, float, float]] = []
+        self._start = None
+
+    def _moveTo(self, pt):
+        self._start = pt
+
+    def _lineTo(self, pt):
+        x0, y0 = self._getCurrentPoint()
+        self.edges.append((x0, y0, pt[0], pt[1]))
+
+    def _qCurveToOne(self, pt1, pt2):
+        p0 = np.array(self._getCurrentPoint(), dtype=np.float64)
+        p1 = np.array(pt1, dtype=np.float64)
+        p2 = np.array(pt2, dtype=np.float64)
+        # A quadratic strays |p0 - 2 p1 + p2| / (8 n^2) from n chords.
+        deviation = np.hypot(*(p0 - 2 * p1 + p2))
+        self._add_polyline(
+            lambda t: (1 - t) ** 2 * p0 + 2 * (1 - t) * t * p1 + t**2 * p2,
+            deviation / 8,
+        )
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        p0 = np.array(self._getCurrentPoint(), dtype=np.float64)
+        p1, p2, p3 = (np.array(pt, dtype=np.float64) for pt in (pt1, pt2, pt3))
+        deviation = max(np.hypot(*(p0 - 2 * p1 + p2)), np.hypot(*(p1 - 2 * p2 + p3)))
+        self._add_polyline(
+            lambda t: (1 - t) ** 3 * p0
+            + 3 * (1 - t) ** 2 * t * p1
+            + 3 * (1 - t) * t**2 * p2
+            + t**3 * p3,
+            deviation * 3 / 4,
+        )
+
+    def _closePath(self):
+        current = self._getCurrentPoint()
+        if current is not None and current != self._start:
+            self._lineTo(self._start)
+
+    def _add_polyline(self, curve, deviation: float) -> None:
+        segments = max(1, math.ceil(math.sqrt(deviation / self.flatness)))
+        t = np.linspace(0, 1, segments + 1)[:, None]
+        points = curve(t)
+        points[0] = self._getCurrentPoint()
+        for (x0, y0), (x1, y1) in zip(points[:-1].tolist(), points[1:].tolist()):
+            self.edges.append((x0, y0, x1, y1))
+
+
+class ScanlineLoader(TTF_Loader):
+    """
+    Loads glyphs as scanlines computed analytically from their outlines,
+    with no rasterising. Each glyph's ImgOut.array is an (H, K) float32
+    array of breakpoints per canvas row: 0, the x of every ink boundary the
+    row's centre line crosses, then the canvas width, repeated to pad rows
+    to the same K. Rows, columns and glyph placement match TTF_Loader's
+    canvas, so searchers and algos see the same coordinates.
+
+    Pair it with Scanline2SDFGenerator. The arrays are a few KB per glyph
+    instead of a canvas, and no bitmap or EDT is ever built.
+    """
+
+    def process(self) -> dict[str, ImgOut]:
+        if self.path is None:
+            raise ValueError("Not Loaded yet.")
+        spacing = self.get_spacing()
+        ttfont = self._font()
+        with self.tracer.span("flatten", category="loader", glyphs=len(self.glyph_set)):
+            names = self._glyph_names(self.glyph_set)
+            by_name = self.flatten(ttfont, names, glyphs=self._glyphs())
+            edges = {glyph: by_name[name] for glyph, name in zip(self.glyph_set, names)}
+        with self.tracer.span(
+            "scanline", category="loader", glyphs=len(self.glyph_set)
+        ):
+            arrays = thread_map(
+                lambda glyph: self.scanlines(edges[glyph], spacing[glyph]),
+                self.glyph_set,
+                threads=self.threads,
+            )
+        imgs_array = {}
+        for glyph, array in zip(self.glyph_set, arrays):
+            glyph_spacing = spacing[glyph]
+            width = glyph_spacing.xMax - glyph_spacing.xMin
+            height = glyph_spacing.yMax - glyph_spacing.yMin
+            imgs_array[glyph] = ImgOut(
+                array=self._keep(glyph, array),
+                center_x=width // 2,
+                height=height,
+                glyph_size=(width, height),
+                canvas_width=width + SPACE * 2,
+            )
+        return imgs_array
+
+    @classmethod
+    def flatten(
+        cls, ttfont: ttLib.TTFont, glyph_set, glyphs=None
+    ) -> dict[str, np.ndarray]:
+        """(E, 4) array of outline edges per glyph, in font units."""
+        full_glyph_set = ttfont.getGlyphSet() if glyphs is None else glyphs
+        edges = {}
+        for glyph in glyph_set:
+            pen = FlatteningPen(glyphSet=full_glyph_set)
+            full_glyph_set[glyph].draw(pen)
+            edges[glyph] = np.array(pen.edges, dtype=np.float64).reshape(-1, 4)
+        return edges
+
+    @staticmethod
+    def scanlines(edges: np.ndarray, glyph_spacing: GlyphSpacing) -> np.ndarray:
+        height = glyph_spacing.ascent - glyph_spacing.descent
+        width = glyph_spacing.xMax - glyph_spacing.xMin + SPACE * 2
+        # Centre line of each canvas row, in font units.
+        ys = glyph_spacing.ascent - 0.5 - np.arange(height)
+
+        x0, y0, x1, y1 = edges.T
+        low = np.minimum(y0, y1)
+        high = np.maximum(y0, y1)
+        edge_index, rows = np.nonzero(
+            (ys[None, :] >= low[:, None]) & (ys[None, :] < high[:, None])
+        )
+        x0, y0, x1, y1 = edges[edge_index].T
+        xs = x0 + (ys[rows] - y0) * (x1 - x0) / (y1 - y0)
+        xs = xs - glyph_spacing.xMin + SPACE
+        directions = np.where(y1 > y0, 1, -1)
+
+        order = np.lexsort((xs, rows))
+        rows, xs, directions = rows[order], xs[order], directions[order]
+        # Closed contours wind back to 0 along every row, so one running
+        # sum gives each row's non-zero winding.
+        after = np.cumsum(directions)
+        before = after - directions
+        boundary = (before == 0) != (after == 0)
+        rows, xs = rows[boundary], xs[boundary]
+
+        counts = np.bincount(rows, minlength=height)
+        breakpoints = np.full(
+            (height, int(counts.max(initial=0)) + 2), width, dtype=np.float32
+        )
+        breakpoints[:, 0] = 0
+        starts = np.cumsum(counts) - counts
+        breakpoints[rows, 1 + np.arange(len(rows)) - starts[rows]] = np.clip(
+            xs, 0, width
+        )
+        return breakpoints
@@ -1,23 +1,90 @@
 from font_fitter_engine.algo import Algo
+from font_fitter_engine.artifacts import NULL_ARTIFACTS, ArtifactLevel, ArtifactWriter
 from font_fitter_engine.loader import ImgOut
 from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Transform
+from font_fitter_engine.transform_cache import TransformCache
+from font_fitter_engine.parallel import thread_map
+from font_fitter_engine.results import SearchResult, StepTrace
+from font_fitter_engine.tracing import NULL_TRACER, Tracer
 import numpy as np
+from typing import Iterator
 
 
 class Searcher:
     """How do we search?"""
 
     def __init__(
-        self, glyph_set: list[str], algos: list[Algo], transform: Transform
+        self,
+        glyph_set: list[str],
+        algos: list[Algo],
+        transform: Transform,
+        cache: TransformCache | None = None,
+        tracer: Tracer | None = None,
+        artifacts: ArtifactWriter | None = None,
     ) -> None:
         self.glyph_set = glyph_set
         self.algos = algos
         self.transform = transform
+        self.cache = cache if cache is not None else TransformCache()
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.artifacts = artifacts if artifacts is not None else NULL_ARTIFACTS
         pass
 
-    def search(self, img_out) -> dict[str, int]:
+    def search(self, img_out: dict[str, ImgOut]) -> dict:
+        """All results, as output[algo][glyph][target]."""
+        output = {}
+        for glyph, glyph_results in self.iter_search(img_out):
+            for algo, targets in glyph_results.items():
+                output.setdefault(algo, {})[glyph] = targets
+        return output
+
+    def iter_search(self, img_out: dict[str, ImgOut]) -> Iterator[tuple[str, dict]]:
+        """Yields (glyph, {algo: {target: result}}) as each glyph completes."""
         raise NotImplementedError
 
+    def cache_key(self) -> tuple:
+        """Identifies the searcher, transform and algo config that results
+        depend on, like Transform.cache_key."""
+        config = {
+            name: value
+            for name, value in vars(self).items()
+            if name
+            not in ("glyph_set", "algos", "transform", "cache", "tracer", "artifacts")
+        }
+        algos = tuple(
+            (type(algo).__name__, tuple(sorted(vars(algo).items())))
+            for algo in self.algos
+        )
+        return (
+            type(self).__name__,
+            tuple(sorted(config.items())),
+            self.transform.cache_key(),
+            algos,
+        )
+
+    def transform_glyph(self, glyph: str, img_out_glyph: ImgOut) -> np.ndarray:
+        with self.tracer.span("transform", category="searcher", glyph=glyph):
+            return self.cache.generate(
+                self.transform,
+                glyph,
+                img_out_glyph.array,
+                content_key=img_out_glyph.cache_key,
+            )
+
+    def transform_glyphs(
+        self, img_out: dict[str, ImgOut], threads: int = 1
+    ) -> dict[str, np.ndarray]:
+        """
+        Transform the glyph set up front, concurrently when `threads` > 1,
+        leaving the results in the cache for `search`.
+        """
+        arrays = thread_map(
+            lambda glyph: self.transform_glyph(glyph, img_out[glyph]),
+            self.glyph_set,
+            threads=threads,
+        )
+        return dict(zip(self.glyph_set, arrays))
+
 
 class StepSearcher(Searcher):
     def __init__(
@@ -31,199 +98,443 @@ class StepSearcher(Searcher):
             300,
         ],
         step_size=2,
+        cache: TransformCache | None = None,
+        trace: bool = False,
+        tracer: Tracer | None = None,
+        artifacts: ArtifactWriter | None = None,
     ) -> None:
+        """
+        trace keeps every evaluated step in the results, for inspecting a
+        search; it is off by default as runs only need the optimum.
+        tracer records a span per glyph transform and per glyph and algo search.
+        artifacts writes each glyph's transformed field at ArtifactLevel.SDF,
+        and its results with step traces at ArtifactLevel.TRACES; those traces
+        only stay in the results when `trace` is set.
+        """
         self.target_densities = target_densities
-        self.step_size = 2
-
-        super().__init__(glyph_set, algos=algos, transform=transform)
-
-    def search(self, img_out: dict[str, ImgOut]):
-        output = {}
-        for algo in self.algos:
-            for glyph in self.glyph_set:
-                for target_density in self.target_densities:
-                    img_out_glyph = img_out[glyph]
-
-                    sdf_array = self.transform.generate(img_out_glyph.array)
+        self.step_size = step_size
+        self.trace = trace
+
+        super().__init__(
+            glyph_set,
+            algos=algos,
+            transform=transform,
+            cache=cache,
+            tracer=tracer,
+            artifacts=artifacts,
+        )
 
-                    height, width, c = img_out_glyph.array.shape
+    def iter_search(self, img_out: dict[str, ImgOut]):
+        for glyph in self.glyph_set:
+            img_out_glyph = img_out[glyph]
 
-                    left_result = self._search_left_side(
-                        sdf_array=sdf_array,
-                        center_x=width // 2,
-                        height=height,
-                        target_density=target_density,
-                        algo=algo,
-                    )
-                    right_result = self._search_right_side(
-                        sdf_array=sdf_array,
-                        center_x=width // 2,
-                        height=height,
-                        target_density=target_density,
-                        algo=algo,
-                    )
-                    if output.get(algo, None) is None:
-                        output[algo] = {}
+            sdf_array = self.transform_glyph(glyph, img_out_glyph)
 
-                    if output[algo].get(glyph, None) is None:
-                        output[algo][glyph] = {}
+            height, width = img_out_glyph.canvas_shape
 
-                    lsb = (
-                        left_result["area"][2]
-                        - left_result["area"][0]
-                        - img_out_glyph.glyph_size[0]
+            glyph_results = {}
+            for algo in self.algos:
+                span = self.tracer.span(
+                    "search", category="searcher", glyph=glyph, algo=type(algo).__name__
+                )
+                with span:
+                    glyph_results[algo] = self._search_glyph(
+                        img_out_glyph, sdf_array, width, height, algo
                     )
-                    output[algo][glyph][target_density] = {
-                        "lsb": lsb,
-                        "optimal_area_left": left_result["area"],
-                        "optimal_area_right": right_result["area"],
-                        "left_density_diff": left_result["density_diff"],
-                        "right_density_diff": right_result["density_diff"],
-                        "left_achieved_density": left_result["achieved_density"],
-                        "right_achieved_density": right_result["achieved_density"],
-                        "left_step_densities": left_result["step_densities"],
-                        "right_step_densities": right_result["step_densities"],
+            self._write_artifacts(glyph, sdf_array, glyph_results)
+            yield glyph, glyph_results
+
+    def _write_artifacts(self, glyph: str, sdf_array, glyph_results: dict) -> None:
+        if isinstance(sdf_array, np.ndarray):
+            self.artifacts.sdf(glyph, sdf_array)
+        if not self.artifacts.wants(ArtifactLevel.TRACES):
+            return
+        for algo, targets in glyph_results.items():
+            for target_density, result in targets.items():
+                self.artifacts.trace(
+                    {
+                        "glyph": glyph,
+                        "algo": type(algo).__name__,
+                        "target_density": target_density,
+                        **result.to_dict(),
                     }
-        print(output)
-        return output
+                )
+                if not self.trace:
+                    result.left_trace = result.right_trace = None
+
+    def _keeps_traces(self) -> bool:
+        return self.trace or self.artifacts.wants(ArtifactLevel.TRACES)
+
+    def _search_glyph(self, img_out_glyph, sdf_array, width, height, algo: Algo):
+        # Built once per SDF so every window below is a cheap lookup.
+        prepared = algo.prepare(sdf_array)
+        targets = {}
+
+        for target_density in self.target_densities:
+            left_result = self._search_left_side(
+                sdf_array=prepared,
+                center_x=width // 2,
+                height=height,
+                target_density=target_density,
+                algo=algo,
+            )
+            right_result = self._search_right_side(
+                sdf_array=prepared,
+                center_x=width // 2,
+                height=height,
+                canvas_width=width,
+                target_density=target_density,
+                algo=algo,
+            )
+
+            lsb = (
+                left_result["area"][2]
+                - left_result["area"][0]
+                - img_out_glyph.glyph_size[0]
+            )
+            targets[target_density] = SearchResult(
+                lsb=lsb,
+                optimal_area_left=left_result["area"],
+                optimal_area_right=right_result["area"],
+                left_density_diff=left_result["density_diff"],
+                right_density_diff=right_result["density_diff"],
+                left_achieved_density=left_result["achieved_density"],
+                right_achieved_density=right_result["achieved_density"],
+                left_trace=left_result["trace"],
+                right_trace=right_result["trace"],
+            )
+        return targets
 
     def _search_left_side(
         self, sdf_array, center_x, height, target_density, algo: Algo
     ):
-        step_densities = []
-
-        width = self.step_size
-        while center_x - width >= 0:
-            x1 = center_x - width
-            y1 = 0
-            x2 = center_x
-            y2 = height
-
-            area = (x1, y1, x2, y2)
-            achieved_density = algo.calculate(sdf_array, area)
-            density_diff = abs(achieved_density - target_density)
-
-            step_densities.append(
-                {
-                    "width": width,
-                    "area": area,
-                    "density": achieved_density,
-                    "density_diff": density_diff,
-                }
-            )
-
-            width += self.step_size
-
-        best_step = min(step_densities, key=lambda x: x["density_diff"])
-
-        return {
-            "area": best_step["area"],
-            "density_diff": best_step["density_diff"],
-            "achieved_density": best_step["density"],
-            "step_densities": step_densities,
-        }
+        widths, areas = self._left_steps(center_x, height)
+        return self._sweep(sdf_array, widths, areas, target_density, algo)
 
     def _search_right_side(
-        self, sdf_array, center_x, height, target_density, algo: Algo
+        self, sdf_array, center_x, height, canvas_width, target_density, algo: Algo
     ):
-        step_densities = []
-
-        width = self.step_size
-        while center_x + width < sdf_array.shape[1]:
-            x1 = center_x
-            y1 = 0
-            x2 = center_x + width
-            y2 = height
-
-            area = (x1, y1, x2, y2)
-            achieved_density = algo.calculate(sdf_array, area)
-            density_diff = abs(achieved_density - target_density)
+        widths, areas = self._right_steps(center_x, height, canvas_width)
+        return self._sweep(sdf_array, widths, areas, target_density, algo)
+
+    def _left_steps(self, center_x, height):
+        widths = np.arange(self.step_size, center_x + 1, self.step_size)
+        areas = np.zeros((len(widths), 4), dtype=np.intp)
+        areas[:, 0] = center_x - widths
+        areas[:, 2] = center_x
+        areas[:, 3] = height
+        return widths, areas
+
+    def _right_steps(self, center_x, height, canvas_width):
+        widths = np.arange(self.step_size, canvas_width - center_x, self.step_size)
+        areas = np.zeros((len(widths), 4), dtype=np.intp)
+        areas[:, 0] = center_x
+        areas[:, 2] = center_x + widths
+        areas[:, 3] = height
+        return widths, areas
+
+    def _sweep(self, sdf_array, widths, areas, target_density, algo: Algo):
+        """Score every step of one side in a single calculate_many call."""
+        densities = algo.calculate_many(sdf_array, areas)
+        density_diffs = np.abs(densities - target_density)
+        best = int(np.argmin(density_diffs))
 
-            step_densities.append(
-                {
-                    "width": width,
-                    "area": area,
-                    "density": achieved_density,
-                    "density_diff": density_diff,
-                }
-            )
+        return {
+            "area": tuple(areas[best].tolist()),
+            "density_diff": float(density_diffs[best]),
+            "achieved_density": float(densities[best]),
+            "trace": (
+                StepTrace(widths, densities, density_diffs)
+                if self._keeps_traces()
+                else None
+            ),
+        }
 
-            width += self.step_size
 
-        best_step = min(step_densities, key=lambda x: x["density_diff"])
+class BisectionSearcher(StepSearcher):
+    """
+    For algos whose density is monotone in window width (Algo.monotone,
+    e.g. SDFVisualAreaAlgo), finds the same step as StepSearcher: each side
+    is galloped over steps 1, 2, 4, ... until the density crosses the
+    target, then bisected, so it costs O(log W) evaluations instead of
+    O(W / step_size). Only the evaluated steps are kept in the trace.
+    Other algos, like SDFVisualDensityAlgo whose floor-divided mean rises
+    and falls, would land on another step, so they are swept step by step
+    as StepSearcher does.
+    """
+
+    def _sweep(self, sdf_array, widths, areas, target_density, algo: Algo):
+        if not algo.monotone:
+            return super()._sweep(sdf_array, widths, areas, target_density, algo)
+        densities: dict[int, float] = {}
+
+        def side_of_target(index: int) -> float:
+            if index not in densities:
+                densities[index] = algo.calculate(sdf_array, tuple(areas[index]))
+            return np.sign(densities[index] - target_density)
+
+        last = len(widths) - 1
+        if last < 0:
+            raise ValueError("No step fits on this side of the glyph.")
+
+        start_side = side_of_target(0)
+        lo = hi = 0
+        if start_side != 0:
+            bound = 1
+            while bound < last and side_of_target(bound) == start_side:
+                lo = bound
+                bound *= 2
+            hi = min(bound, last)
+            if side_of_target(hi) == start_side:
+                lo = hi
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if side_of_target(mid) == start_side:
+                    lo = mid
+                else:
+                    hi = mid
+
+        indices = np.array(sorted(densities), dtype=np.intp)
+        probe_densities = np.array([densities[index] for index in indices])
+        density_diffs = np.abs(probe_densities - target_density)
+        best = int(np.argmin(density_diffs))
 
         return {
-            "area": best_step["area"],
-            "density_diff": best_step["density_diff"],
-            "achieved_density": best_step["density"],
-            "step_densities": step_densities,
+            "area": tuple(areas[indices[best]].tolist()),
+            "density_diff": float(density_diffs[best]),
+            "achieved_density": float(probe_densities[best]),
+            "trace": (
+                StepTrace(widths[indices], probe_densities, density_diffs)
+                if self._keeps_traces()
+                else None
+            ),
         }
 
-    def _calculate_density(self, sdf_array: np.ndarray, calculation_area):
-        x1, y1, x2, y2 = calculation_area
-        zone_sdf = sdf_array[y1:y2, x1:x2]
-        area_visual_density = np.sum(zone_sdf) // (
-            zone_sdf.shape[0] * zone_sdf.shape[1]
-        )
-        return float(area_visual_density)
 
+class PyramidSearcher(StepSearcher):
+    """
+    Coarse-to-fine StepSearcher. Each raster is block averaged by `factor`
+    (e.g. 4 turns a 1000 upem raster into a 250 upem one), transformed at
+    that size and upsampled back, in full resolution pixel units. Only the
+    ink bbox grown by `band` px is transformed at full resolution and pasted
+    over it, as far from ink the coarse distances are already close.
+    A StepSearcher sweep over the coarse SDF finds each optimum roughly,
+    and each side is then swept again over `refine_steps` steps either side
+    of it on the refined SDF.
+
+    Costs scale with the glyph rather than the padded canvas. Windows
+    reaching past the band carry the coarse error, so `accuracy_bound`
+    reports how far results are from StepSearcher on a sample of glyphs.
+    It searches the sample at full resolution, so it is costly and only
+    meant to be run on a few glyphs.
+    """
 
-class BinomialSearcher(Searcher):
     def __init__(
         self,
-        glyph_set,
-        algo,
-        min_gap: int = 0,
-        max_gap: int = 200,
-        limit: int = 40,
-        target: int = 100,
+        glyph_set: list[str],
+        algos: list[Algo],
+        transform: Transform,
+        target_densities: list[int] = [
+            100,
+            200,
+            300,
+        ],
+        step_size=2,
+        factor: int = 4,
+        band: int = 32,
+        refine_steps: int = 8,
+        cache: TransformCache | None = None,
+        trace: bool = False,
+        tracer: Tracer | None = None,
+        artifacts: ArtifactWriter | None = None,
     ) -> None:
-        self.min_gap = min_gap
-        self.max_gap = max_gap
-        self.limit = limit
-        self.target = target
-        self.boundary = 10
+        self.factor = factor
+        self.band = band
+        self.refine_steps = refine_steps
+        super().__init__(
+            glyph_set,
+            algos=algos,
+            transform=transform,
+            target_densities=target_densities,
+            step_size=step_size,
+            cache=cache,
+            trace=trace,
+            tracer=tracer,
+            artifacts=artifacts,
+        )
 
-        super().__init__(glyph_set=glyph_set, algo=algo)
+    def transform_glyphs(
+        self, img_out: dict[str, ImgOut], threads: int = 1
+    ) -> dict[str, np.ndarray]:
+        # The pyramid never transforms a whole canvas at full resolution,
+        # so there is nothing worth precomputing.
+        return {}
 
-    def search(self, output):
-        """create search plan"""
-        final_result = {}
+    def iter_search(self, img_out: dict[str, ImgOut]):
         for glyph in self.glyph_set:
-            idx = 0
-            calc_val = -100
-            max_g = self.max_gap
-            min_g = self.min_gap
-
-            max_val = calc_val = self.algo.calculate(glyph, output, max_g)
-            min_val = calc_val = self.algo.calculate(glyph, output, min_g)
-            direction = 1 if max_val - min_val > 0 else -1
-            while True:
-                idx += 1
-                mid = (max_g + min_g) // 2
-                if (
-                    idx > self.limit
-                    or (
-                        calc_val < self.target + self.boundary
-                        and calc_val > self.target - self.boundary
+            img_out_glyph = img_out[glyph]
+            array = img_out_glyph.array
+            height, width = array.shape[:2]
+            center_x = width // 2
+
+            with self.tracer.span("coarse_transform", category="searcher", glyph=glyph):
+                coarse_sdf = self._coarse_sdf(array)
+            with self.tracer.span("transform", category="searcher", glyph=glyph):
+                sdf_array = self._refine_sdf(array, coarse_sdf)
+
+            left_steps = self._left_steps(center_x, height)
+            right_steps = self._right_steps(center_x, height, width)
+            glyph_results = {}
+            for algo in self.algos:
+                span = self.tracer.span(
+                    "search", category="searcher", glyph=glyph, algo=type(algo).__name__
+                )
+                with span:
+                    coarse = algo.prepare(coarse_sdf)
+                    prepared = algo.prepare(sdf_array)
+                    glyph_results[algo] = {}
+                    for target_density in self.target_densities:
+                        coarse_left = self._sweep(
+                            coarse, *left_steps, target_density, algo
+                        )["area"]
+                        coarse_right = self._sweep(
+                            coarse, *right_steps, target_density, algo
+                        )["area"]
+                        left_result = self._sweep(
+                            prepared,
+                            *self._near(*left_steps, center_x - coarse_left[0]),
+                            target_density,
+                            algo,
+                        )
+                        right_result = self._sweep(
+                            prepared,
+                            *self._near(*right_steps, coarse_right[2] - center_x),
+                            target_density,
+                            algo,
+                        )
+
+                        glyph_results[algo][target_density] = SearchResult(
+                            lsb=(
+                                left_result["area"][2]
+                                - left_result["area"][0]
+                                - img_out_glyph.glyph_size[0]
+                            ),
+                            optimal_area_left=left_result["area"],
+                            optimal_area_right=right_result["area"],
+                            left_density_diff=left_result["density_diff"],
+                            right_density_diff=right_result["density_diff"],
+                            left_achieved_density=left_result["achieved_density"],
+                            right_achieved_density=right_result["achieved_density"],
+                            left_trace=left_result["trace"],
+                            right_trace=right_result["trace"],
+                        )
+            self._write_artifacts(glyph, sdf_array, glyph_results)
+            yield glyph, glyph_results
+
+    def _coarse_sdf(self, array: np.ndarray) -> np.ndarray:
+        """
+        SDF of the raster block averaged by `factor`, in full resolution
+        pixel units and upsampled back to the shape of `array`.
+        """
+        factor = self.factor
+        height, width = array.shape[:2]
+        pad_height = -height % factor
+        pad_width = -width % factor
+        padding = [(0, pad_height), (0, pad_width)] + [(0, 0)] * (array.ndim - 2)
+        padded = np.pad(array, padding, mode="edge")
+        blocks = padded.reshape(
+            (height + pad_height) // factor,
+            factor,
+            (width + pad_width) // factor,
+            factor,
+            *array.shape[2:],
+        )
+        coarse = blocks.mean(axis=(1, 3)).astype(array.dtype)
+        coarse_sdf = self.transform.generate(coarse) * np.float32(factor)
+        upsampled = np.repeat(np.repeat(coarse_sdf, factor, axis=0), factor, axis=1)
+        return upsampled[:height, :width]
+
+    def _refine_sdf(self, array: np.ndarray, coarse_sdf: np.ndarray) -> np.ndarray:
+        """
+        coarse_sdf with the pixels within `band` px of the ink bbox
+        transformed at full resolution. Pixels differing from the canvas
+        corner count as ink, so the cropped transform sees the whole glyph
+        and is exact.
+        """
+        drawn = array != array[0, 0]
+        if drawn.ndim > 2:
+            drawn = drawn.any(axis=tuple(range(2, drawn.ndim)))
+        rows = np.flatnonzero(drawn.any(axis=1))
+        sdf_array = coarse_sdf.copy()
+        if len(rows) == 0:
+            return sdf_array
+        columns = np.flatnonzero(drawn.any(axis=0))
+        height, width = drawn.shape
+        crop = (
+            slice(max(0, rows[0] - self.band), min(height, rows[-1] + 1 + self.band)),
+            slice(
+                max(0, columns[0] - self.band), min(width, columns[-1] + 1 + self.band)
+            ),
+        )
+        sdf_array[crop] = self.transform.generate(array[crop])
+        return sdf_array
+
+    def _near(self, widths, areas, coarse_width):
+        """The steps within refine_steps of the coarse optimum."""
+        near = np.abs(widths - coarse_width) <= self.refine_steps * self.step_size
+        return widths[near], areas[near]
+
+    def accuracy_bound(
+        self,
+        img_out: dict[str, ImgOut],
+        results: dict[str, dict],
+        bounds: dict[str, dict] | None = None,
+    ) -> dict[str, dict]:
+        """
+        Largest differences of `results`, this searcher's iter_search output
+        per glyph of `img_out`, from a full resolution StepSearcher with the
+        same settings, per algo: in lsb and right window width (px), and in
+        how much further from the target the achieved density is. Only the
+        reference is searched. Given the `bounds` of earlier glyphs, e.g. of
+        a previous chunk, returns them widened by these.
+        """
+        reference = StepSearcher(
+            list(results),
+            algos=self.algos,
+            transform=self.transform,
+            target_densities=self.target_densities,
+            step_size=self.step_size,
+            cache=self.cache,
+        ).search(img_out)
+
+        bounds = {} if bounds is None else bounds
+        for algo, glyphs in reference.items():
+            bound = bounds.setdefault(
+                type(algo).__name__,
+                {
+                    "max_lsb_error": 0,
+                    "max_rsb_error": 0,
+                    "max_density_diff_excess": 0.0,
+                },
+            )
+            for glyph, targets in glyphs.items():
+                for target_density, expected in targets.items():
+                    result = results[glyph][algo][target_density]
+                    bound["max_lsb_error"] = max(
+                        bound["max_lsb_error"], int(abs(result.lsb - expected.lsb))
+                    )
+                    bound["max_rsb_error"] = max(
+                        bound["max_rsb_error"],
+                        int(
+                            abs(
+                                result.optimal_area_right[2]
+                                - expected.optimal_area_right[2]
+                            )
+                        ),
+                    )
+                    bound["max_density_diff_excess"] = max(
+                        bound["max_density_diff_excess"],
+                        result.left_density_diff - expected.left_density_diff,
+                        result.right_density_diff - expected.right_density_diff,
                     )
-                    or mid == min_g
-                    or mid == max_g
-                ):
-                    break
-
-                calc_val = self.algo.calculate(glyph, output, mid)
-
-                if calc_val > self.target + self.boundary:
-                    if direction:
-                        min_g = mid
-                    else:
-                        max_g = mid
-                elif calc_val < self.target - self.boundary:
-                    if direction:
-                        max_g = mid
-                    else:
-                        min_g = mid
-
-            final_result[glyph] = mid
-        return final_result
+        return bounds
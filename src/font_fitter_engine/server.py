@@ -0,0 +1,259 @@
+import asyncio
+import json
+import signal
+import socket
+import sys
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+
+from font_fitter_engine.engine import Location, SpacingEngine, _fit_glyphs_in_worker
+from font_fitter_engine.results import _to_json
+
+DEFAULT_BATCH_DELAY = 0.005
+# Glyphs whose records are memoised, across fonts and styles.
+DEFAULT_MEMO_SIZE = 65536
+STYLES = ("run", "validate", "kern")
+
+
+class _Batch:
+    __slots__ = ("glyphs", "future")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.glyphs: dict[str, None] = {}
+        self.future = future
+
+
+class FittingServer:
+    """
+    Long-running local fitting service around a SpacingEngine. Callers pay
+    for the imports and the font loading once, not per subprocess.
+
+    Clients connect over a Unix socket (or TCP) and send one JSON request
+    per line. Each request is answered by one JSON line with the same id:
+
+        {"id": 1, "style": "run", "font": "/fonts/A.ttf", "glyphs": ["a", "H"]}
+        {"id": 1, "records": [...]}          or {"id": 1, "error": "..."}
+
+    "glyphs" defaults to the engine's glyph set, and "location" selects a
+    variable font instance. Requests for the same font, style and instance
+    that arrive within `batch_delay` seconds are merged into one job over
+    the union of their glyphs; "kern" only merges identical glyph sets, as
+    a kerning table depends on the whole set. Jobs run on `workers`
+    processes, or on one in-process thread with workers <= 1. Each keeps
+    its engine, parsed fonts and caches between jobs. Give the engine a
+    MemoryCache to keep rasters and SDFs warm.
+
+    "run" and "validate" records are memoised per glyph until the font
+    file changes, so repeated requests need no fitting at all. When a
+    merged job fails, its glyphs are fitted one by one, so a request only
+    fails on its own glyphs (e.g. one missing from the font), not on those
+    another request added to the batch.
+    """
+
+    def __init__(
+        self,
+        engine: SpacingEngine,
+        workers: int = 1,
+        batch_delay: float = DEFAULT_BATCH_DELAY,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ) -> None:
+        self.engine = engine
+        self.workers = workers
+        self.batch_delay = batch_delay
+        self.memo_size = memo_size
+        self._memo: OrderedDict[tuple, list[dict]] = OrderedDict()
+        self._batches: dict[tuple, _Batch] = {}
+        self._executor: Executor | None = None
+
+    async def fit(
+        self,
+        style: str,
+        font: str | Path,
+        glyphs: list[str] | None = None,
+        location: Location | None = None,
+    ) -> list[dict]:
+        """Records of `style` for `glyphs` of the font, in glyph order."""
+        if style not in STYLES:
+            raise ValueError(f"Style {style} not implemented")
+        path = Path(font).resolve()
+        glyphs = list(self.engine.loader.glyph_set if glyphs is None else glyphs)
+        font_key = (
+            style,
+            str(path),
+            path.stat().st_mtime_ns,
+            None if location is None else tuple(sorted(location.items())),
+        )
+
+        if style == "kern":
+            batch_key = font_key + (tuple(glyphs),)
+            return await self._batched(batch_key, path, glyphs, location)
+
+        found = {
+            glyph: self._memo[font_key + (glyph,)]
+            for glyph in glyphs
+            if font_key + (glyph,) in self._memo
+        }
+        missing = [glyph for glyph in glyphs if glyph not in found]
+        if missing:
+            by_glyph = await self._batched(font_key, path, missing, location)
+            for glyph in missing:
+                if isinstance(by_glyph[glyph], Exception):
+                    raise by_glyph[glyph]
+                found[glyph] = by_glyph[glyph]
+        for glyph in glyphs:
+            if font_key + (glyph,) in self._memo:
+                self._memo.move_to_end(font_key + (glyph,))
+        return [record for glyph in glyphs for record in found[glyph]]
+
+    async def _batched(self, batch_key: tuple, path: Path, glyphs, location):
+        batch = self._batches.get(batch_key)
+        if batch is None:
+            batch = _Batch(asyncio.get_running_loop().create_future())
+            self._batches[batch_key] = batch
+            asyncio.create_task(self._run_batch(batch_key, batch, path, location))
+        batch.glyphs.update(dict.fromkeys(glyphs))
+        return await asyncio.shield(batch.future)
+
+    async def _run_batch(
+        self, batch_key: tuple, batch: _Batch, path: Path, location: Location | None
+    ) -> None:
+        await asyncio.sleep(self.batch_delay)
+        # Later requests start a new batch from here on.
+        del self._batches[batch_key]
+        style = batch_key[0]
+        glyphs = list(batch.glyphs)
+        try:
+            records = await self._run_job(style, path, glyphs, location)
+        except Exception as e:
+            if style == "kern" or len(glyphs) == 1:
+                batch.future.set_exception(e)
+                return
+            by_glyph = {}
+            for glyph in glyphs:
+                try:
+                    by_glyph[glyph] = await self._run_job(
+                        style, path, [glyph], location
+                    )
+                except Exception as glyph_error:
+                    by_glyph[glyph] = glyph_error
+        else:
+            if style == "kern":
+                batch.future.set_result(records)
+                return
+            by_glyph = {glyph: [] for glyph in glyphs}
+            for record in records:
+                by_glyph[record["glyph"]].append(record)
+
+        for glyph, glyph_records in by_glyph.items():
+            if not isinstance(glyph_records, Exception):
+                self._memo[batch_key + (glyph,)] = glyph_records
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        batch.future.set_result(by_glyph)
+
+    async def _run_job(
+        self, style: str, path: Path, glyphs: list[str], location: Location | None
+    ) -> list[dict]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool(), self._job(), style, path, glyphs, location
+        )
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 1:
+                self._executor = self.engine.process_pool(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    def _job(self):
+        if self.workers > 1:
+            return _fit_glyphs_in_worker
+        return self.engine.fit_glyphs
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers the requests of one connection. Requests are handled
+        concurrently, so pipelined requests can share batches."""
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        response: dict = {}
+        try:
+            request = json.loads(line)
+            response["id"] = request.get("id")
+            response["records"] = await self.fit(
+                request.get("style", "run"),
+                request["font"],
+                glyphs=request.get("glyphs"),
+                location=request.get("location"),
+            )
+        except Exception as e:
+            response["error"] = repr(e)
+        writer.write(json.dumps(response, default=_to_json).encode() + b"\n")
+        await writer.drain()
+
+    async def serve(
+        self, path: str | None = None, host: str = "127.0.0.1", port: int | None = None
+    ) -> None:
+        """Serves on the Unix socket at path, or on host:port with a port."""
+        if port is not None:
+            server = await asyncio.start_server(self.handle, host, port)
+        else:
+            Path(path).unlink(missing_ok=True)
+            server = await asyncio.start_unix_server(self.handle, path)
+        address = f"{host}:{port}" if port is not None else path
+        print(f"Serving on {address}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    def run(
+        self, path: str | None = None, host: str = "127.0.0.1", port: int | None = None
+    ) -> None:
+        """Blocking serve, until interrupted or terminated."""
+
+        async def serve_until_terminated() -> None:
+            # Stop on SIGTERM too, so the worker processes are shut down.
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, asyncio.current_task().cancel
+            )
+            await self.serve(path, host=host, port=port)
+
+        try:
+            asyncio.run(serve_until_terminated())
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+def send_request(address: str | tuple[str, int], request: dict) -> dict:
+    """
+    Sends one request to a FittingServer and returns its response. address
+    is a Unix socket path or a (host, port) pair.
+    """
+    if isinstance(address, tuple):
+        connection = socket.create_connection(address)
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(address)
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator
+
+
+class Tracer:
+    """
+    Records timed spans of the pipeline stages (parse, rasterise, normalize,
+    save, transform, search, ...) tagged with the font, glyph or algo they
+    ran for. Spans are kept as Chrome trace events, so a run can be opened in
+    chrome://tracing or Perfetto, and can be aggregated into a per-stage
+    summary table.
+
+    Components take a tracer at construction and default to NULL_TRACER,
+    whose spans cost a single call when tracing is off.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **args) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def extend(self, events: list[dict]) -> None:
+        """Merge events recorded elsewhere, e.g. by a pool worker."""
+        with self._lock:
+            self.events.extend(events)
+
+    def drain(self) -> list[dict]:
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def to_chrome_trace(self) -> dict:
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: str | Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+    def summary(self) -> list[dict]:
+        """Count, total, mean and max duration in ms per category and stage,
+        slowest total first."""
+        stages: dict[tuple[str, str], list[float]] = {}
+        for event in self.events:
+            stages.setdefault((event["cat"], event["name"]), []).append(
+                event["dur"] / 1000
+            )
+        rows = [
+            {
+                "category": category,
+                "stage": name,
+                "count": len(durations),
+                "total_ms": sum(durations),
+                "mean_ms": sum(durations) / len(durations),
+                "max_ms": max(durations),
+            }
+            for (category, name), durations in stages.items()
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def format_summary(self) -> str:
+        lines = [
+            f"{'category':10} {'stage':16} {'count':>7} {'total ms':>11} "
+            f"{'mean ms':>9} {'max ms':>9}"
+        ]
+        for row in self.summary():
+            lines.append(
+                f"{row['category']:10} {row['stage']:16} {row['count']:7d} "
+                f"{row['total_ms']:11.2f} {row['mean_ms']:9.2f} {row['max_ms']:9.2f}"
+            )
+        return "\n".join(lines)
+
+    def __getstate__(self) -> dict:
+        # Events are per process; a pickled tracer (e.g. sent to a worker)
+        # starts empty and its events are merged back with `extend`.
+        state = self.__dict__.copy()
+        state["events"] = []
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class NullTracer(Tracer):
+    """Tracer that records nothing."""
+
+    enabled = False
+
+    def span(self, name: str, category: str = "stage", **args):
+        return _NULL_SPAN
+
+    def extend(self, events: list[dict]) -> None:
+        pass
+
+
+_NULL_SPAN = nullcontext()
+
+NULL_TRACER = NullTracer()
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable
+
+import numpy as np
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Transform
+from font_fitter_engine.disk_cache import DiskCache
+from font_fitter_engine.glyph_store import GlyphStore
+
+
+class TransformCache:
+    """
+    LRU cache of transformed glyph arrays, shared by the searcher and the
+    validator so each glyph is transformed once per font load.
+
+    Entries are keyed by glyph, source array and transform config. The source
+    array is held by the entry and compared by identity, so a glyph of a newly
+    loaded font never hits a stale entry from a previous one.
+
+    With a `disk` cache, memory misses for rasters that carry a content key
+    are looked up on disk before transforming, and stored there afterwards.
+    With a `store`, transformed arrays are written to the GlyphStore and
+    only their names are cached; every hit maps the array afresh, so its
+    pages are released once the caller drops it. Transforms that return
+    something other than an array (a ScanlineField) are cached as they are.
+    clear() starts the store over too.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 32,
+        disk: DiskCache | None = None,
+        store: GlyphStore | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.disk = disk
+        self.store = store
+        self._entries: OrderedDict[Hashable, tuple[np.ndarray, np.ndarray | str]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+    def generate(
+        self,
+        transform: Transform,
+        glyph: str,
+        array: np.ndarray,
+        content_key: str | None = None,
+    ) -> np.ndarray:
+        key = (glyph, id(array), transform.cache_key())
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and entry[0] is array:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if isinstance(entry[1], str):
+                    return self.store.get(entry[1])
+                return entry[1]
+            self.misses += 1
+
+        transformed = self._generate(transform, array, content_key)
+        cached = transformed
+        if self.store is not None and isinstance(transformed, np.ndarray):
+            # Unique per source and transform config, as other fonts and
+            # configs share the store; without a content key the source is
+            # the array, which the entry keeps alive so its id is not reused.
+            source = content_key if content_key is not None else (glyph, id(array))
+            cached = DiskCache.key("transform", source, transform.cache_key())
+            transformed = self.store.put(cached, transformed)
+            self.store.release(array)
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = (array, cached)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return transformed
+
+    def _generate(
+        self, transform: Transform, array: np.ndarray, content_key: str | None
+    ) -> np.ndarray:
+        if self.disk is None or content_key is None:
+            return transform.generate(array)
+
+        disk_key = self.disk.key("transform", content_key, transform.cache_key())
+        cached = self.disk.get(disk_key)
+        if cached is not None:
+            return cached["array"]
+        transformed = transform.generate(array)
+        self.disk.put(disk_key, {"array": transformed})
+        return transformed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self.store is not None:
+                self.store.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        # Entries are per process; a pickled cache (e.g. sent to a worker)
+        # starts empty.
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
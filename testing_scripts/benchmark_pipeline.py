@@ -0,0 +1,364 @@
+"""
+Benchmark script for the font fitting pipeline
+Purpose: Time every pipeline stage on the bundled test fonts and measure how the engine scales
+Inputs: fonts in testing_files/ and testing_files_fonts/
+Outputs: per-stage throughput and peak memory, plus scaling curves over glyph count,
+         canvas width and worker count, printed and saved as CSV reports
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualAreaAlgo,
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.engine import SpacingEngine
+from font_fitter_engine.loader import ImgOut, TTF_Loader
+from font_fitter_engine.searcher import (
+    BisectionSearcher,
+    PyramidSearcher,
+    StepSearcher,
+)
+
+FONT_DIRS = ["testing_files", "testing_files_fonts"]
+OUTPUT_DIR = "outputs/benchmark_reports/"
+CANDIDATE_GLYPHS = "aHObcyonstdefghijklmpqruvwxzABCDEFGIJKLMNPQRSTUVWXYZ"
+DEFAULT_GLYPH_COUNT = 6
+GLYPH_COUNTS = [1, 2, 4, 8, 16]
+CANVAS_WIDTH_FACTORS = [1, 2, 4]
+WORKER_COUNTS = [1, 2, 4]
+TARGET_DENSITIES = [100, 200, 300]
+ALGOS = [SDFVisualDensityAlgo, SDFVisualAreaAlgo]
+SEARCHERS = [StepSearcher, BisectionSearcher, PyramidSearcher]
+
+REPORT_FIELDS = ["stage", "font", "items", "unit", "seconds", "throughput", "peak_mb"]
+
+
+def measure(fn, repeat=1, trace_memory=True):
+    """Best wall time over `repeat` runs and the traced peak memory of the last one."""
+    best = float("inf")
+    peak = 0
+    result = None
+    for _ in range(repeat):
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result, best, peak
+
+
+def report_row(stage, font, items, unit, seconds, peak):
+    return {
+        "stage": stage,
+        "font": font,
+        "items": items,
+        "unit": unit,
+        "seconds": round(seconds, 6),
+        "throughput": round(items / seconds, 3) if seconds > 0 else float("inf"),
+        "peak_mb": round(peak / 1024**2, 2),
+    }
+
+
+def find_fonts(font_dirs):
+    fonts = []
+    for font_dir in font_dirs:
+        if not os.path.isdir(font_dir):
+            continue
+        for filename in sorted(os.listdir(font_dir)):
+            if filename.lower().endswith((".ttf", ".otf")):
+                fonts.append(os.path.join(font_dir, filename))
+    return fonts
+
+
+def available_glyphs(loader, count):
+    """Characters whose glyph name matches the character, as the loader expects."""
+    cmap = loader.ttf_font.getBestCmap()
+    glyphs = [g for g in CANDIDATE_GLYPHS if cmap.get(ord(g), None) == g]
+    return glyphs[:count]
+
+
+def quiet(fn):
+    """Runs fn with the engine's records and progress prints suppressed."""
+    with (
+        contextlib.redirect_stdout(io.StringIO()),
+        contextlib.redirect_stderr(io.StringIO()),
+    ):
+        return fn()
+
+
+def bench_stages(font_path, glyph_count, repeat):
+    font = os.path.basename(font_path)
+    rows = []
+
+    loader = TTF_Loader(glyph_set=[], save_dir=None)
+    _, seconds, peak = measure(lambda: loader.load(font_path), repeat)
+    rows.append(report_row("load", font, 1, "fonts/s", seconds, peak))
+
+    glyph_set = available_glyphs(loader, glyph_count)
+    loader.glyph_set = glyph_set
+    n = len(glyph_set)
+
+    imgs, seconds, peak = measure(
+        lambda: TTF_Loader.rasterise(loader.ttf_font, glyph_set), repeat
+    )
+    rows.append(report_row("rasterise", font, n, "glyphs/s", seconds, peak))
+
+    spacing = loader.get_spacing()
+    normalized, seconds, peak = measure(
+        lambda: TTF_Loader.normalize(imgs, spacing), repeat
+    )
+    rows.append(report_row("normalize", font, n, "glyphs/s", seconds, peak))
+
+    arrays = {glyph: np.array(img) for glyph, img in normalized.items()}
+    transform = Raster2SDFGenerator()
+    sdfs, seconds, peak = measure(
+        lambda: {glyph: transform.generate(array) for glyph, array in arrays.items()},
+        repeat,
+    )
+    rows.append(report_row("transform", font, n, "glyphs/s", seconds, peak))
+
+    for algo_cls in ALGOS:
+        algo = algo_cls()
+        prepared, seconds, peak = measure(
+            lambda: [algo.prepare(sdf) for sdf in sdfs.values()], repeat
+        )
+        rows.append(
+            report_row(
+                f"prepare:{algo_cls.__name__}", font, n, "glyphs/s", seconds, peak
+            )
+        )
+
+        sweeps = [left_sweep_areas(sdf) for sdf in sdfs.values()]
+        windows = sum(len(areas) for areas in sweeps)
+        _, seconds, peak = measure(
+            lambda: [
+                algo.calculate_many(table, areas)
+                for table, areas in zip(prepared, sweeps)
+            ],
+            repeat,
+        )
+        rows.append(
+            report_row(
+                f"algo:{algo_cls.__name__}", font, windows, "windows/s", seconds, peak
+            )
+        )
+
+    img_out = {
+        glyph: ImgOut(
+            array=arrays[glyph],
+            center_x=imgs[glyph].width // 2,
+            height=imgs[glyph].height,
+            glyph_size=imgs[glyph].size,
+        )
+        for glyph in glyph_set
+    }
+    for searcher_cls in SEARCHERS:
+        searcher = searcher_cls(
+            glyph_set=glyph_set,
+            algos=[algo_cls() for algo_cls in ALGOS],
+            transform=transform,
+            target_densities=TARGET_DENSITIES,
+        )
+        # Transforms are timed above, so searchers run on warm SDFs; the
+        # pyramid transforms its own coarse and cropped levels inside search.
+        searcher.transform_glyphs(img_out)
+        _, seconds, peak = measure(lambda: searcher.search(img_out), repeat)
+        rows.append(
+            report_row(
+                f"search:{searcher_cls.__name__}", font, n, "glyphs/s", seconds, peak
+            )
+        )
+
+    return rows
+
+
+def left_sweep_areas(sdf, step_size=2):
+    height, width = sdf.shape[:2]
+    center_x = width // 2
+    widths = np.arange(step_size, center_x + 1, step_size)
+    areas = np.zeros((len(widths), 4), dtype=np.intp)
+    areas[:, 0] = center_x - widths
+    areas[:, 2] = center_x
+    areas[:, 3] = height
+    return areas
+
+
+def make_searcher(glyph_set):
+    return StepSearcher(
+        glyph_set=glyph_set,
+        algos=[SDFVisualDensityAlgo()],
+        transform=Raster2SDFGenerator(),
+        target_densities=TARGET_DENSITIES,
+    )
+
+
+def scale_glyph_count(font_path):
+    font = os.path.basename(font_path)
+    probe = TTF_Loader(glyph_set=[], save_dir=None)
+    probe.load(font_path)
+    glyphs = available_glyphs(probe, max(GLYPH_COUNTS))
+
+    rows = []
+    for count in GLYPH_COUNTS:
+        glyph_set = glyphs[:count]
+        loader = TTF_Loader(glyph_set=glyph_set, save_dir=None)
+        searcher = make_searcher(glyph_set)
+
+        def fit():
+            loader.load(font_path)
+            return searcher.search(loader.process())
+
+        _, seconds, peak = measure(fit)
+        rows.append(
+            report_row(
+                f"glyph_count={len(glyph_set)}",
+                font,
+                len(glyph_set),
+                "glyphs/s",
+                seconds,
+                peak,
+            )
+        )
+    return rows
+
+
+def scale_canvas_width(font_path):
+    font = os.path.basename(font_path)
+    loader = TTF_Loader(glyph_set=["H"], save_dir=None)
+    loader.load(font_path)
+    glyph = loader.process()["H"]
+    height, width = glyph.array.shape[:2]
+
+    rows = []
+    for factor in CANVAS_WIDTH_FACTORS:
+        pad = (width * factor - width) // 2
+        array = np.pad(
+            glyph.array,
+            ((0, 0), (pad, pad), (0, 0)),
+            mode="constant",
+            constant_values=255,
+        )
+        img_out = {
+            "H": ImgOut(
+                array=array,
+                center_x=glyph.center_x,
+                height=glyph.height,
+                glyph_size=glyph.glyph_size,
+            )
+        }
+        searcher = make_searcher(["H"])
+        _, seconds, peak = measure(lambda: searcher.search(img_out))
+        rows.append(
+            report_row(
+                f"canvas_width={array.shape[1]}", font, 1, "glyphs/s", seconds, peak
+            )
+        )
+    return rows
+
+
+def scale_workers(font_paths, glyph_count):
+    rows = []
+    with tempfile.TemporaryDirectory() as font_dir:
+        for font_path in font_paths:
+            os.symlink(
+                os.path.abspath(font_path),
+                os.path.join(font_dir, os.path.basename(font_path)),
+            )
+        # Glyphs every font has, so no font fails on a missing one.
+        common = None
+        for font_path in font_paths:
+            probe = TTF_Loader(glyph_set=[], save_dir=None)
+            probe.load(font_path)
+            glyphs = available_glyphs(probe, len(CANDIDATE_GLYPHS))
+            common = glyphs if common is None else [g for g in common if g in glyphs]
+        glyph_set = common[:glyph_count]
+        engine = SpacingEngine(
+            loader=TTF_Loader(glyph_set=glyph_set, save_dir=None),
+            searcher=make_searcher(glyph_set),
+        )
+        for workers in WORKER_COUNTS:
+            _, seconds, _ = measure(
+                lambda: quiet(lambda: list(engine.iter_run(font_dir, workers=workers))),
+                trace_memory=False,
+            )
+            rows.append(
+                report_row(
+                    f"workers={workers}", "all", len(font_paths), "fonts/s", seconds, 0
+                )
+            )
+    return rows
+
+
+def save_report(rows, output_path):
+    with open(output_path, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Report saved to: {output_path}")
+
+
+def print_rows(title, rows):
+    print(f"\n{title}")
+    print("-" * 96)
+    for row in rows:
+        print(
+            f"{row['stage']:34} | {row['font']:32.32} | "
+            f"{row['throughput']:10.2f} {row['unit']:10} | "
+            f"peak {row['peak_mb']:8.2f} MB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fonts", nargs="*", default=FONT_DIRS)
+    parser.add_argument("--glyphs", type=int, default=DEFAULT_GLYPH_COUNT)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--skip-scaling", action="store_true")
+    args = parser.parse_args()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    font_paths = find_fonts(args.fonts)
+    if not font_paths:
+        print(f"No font files found in {args.fonts}")
+        return
+    print(f"Found {len(font_paths)} fonts to benchmark")
+
+    stage_rows = []
+    for font_path in font_paths:
+        print(f"Benchmarking stages on {font_path}")
+        stage_rows.extend(bench_stages(font_path, args.glyphs, args.repeat))
+    print_rows("Pipeline stages", stage_rows)
+    save_report(stage_rows, os.path.join(OUTPUT_DIR, "stages.csv"))
+
+    if not args.skip_scaling:
+        scaling_rows = (
+            scale_glyph_count(font_paths[0])
+            + scale_canvas_width(font_paths[0])
+            + scale_workers(font_paths, args.glyphs)
+        )
+        print_rows("Scaling", scaling_rows)
+        save_report(scaling_rows, os.path.join(OUTPUT_DIR, "scaling.csv"))
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nPeak RSS of the benchmark process: {peak_rss:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
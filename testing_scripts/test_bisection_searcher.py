@@ -0,0 +1,45 @@
+"""
+Test script for BisectionSearcher
+Purpose: Check that it finds the same windows as StepSearcher on real glyphs, for every algo
+"""
+
+from pathlib import Path
+
+import pytest
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualAreaAlgo,
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.loader import TTF_Loader
+from font_fitter_engine.searcher import BisectionSearcher, StepSearcher
+
+FONTS = Path(__file__).parent.parent / "testing_files"
+GLYPHS = ["a", "H", "O", "y"]
+
+
+@pytest.mark.parametrize("font", ["Actor-Regular.ttf", "Astloch-Regular.ttf"])
+def test_same_windows_as_step_searcher(font):
+    loader = TTF_Loader(glyph_set=GLYPHS, save_dir=None, grayscale=True)
+    loader.load(FONTS / font)
+    img_out = loader.process()
+    options = dict(
+        algos=[SDFVisualDensityAlgo(), SDFVisualAreaAlgo()],
+        transform=Raster2SDFGenerator(),
+        step_size=2,
+    )
+    step = StepSearcher(GLYPHS, **options)
+    expected = step.search(img_out)
+    # Same SDFs, so only the searches differ.
+    bisection = BisectionSearcher(GLYPHS, cache=step.cache, **options)
+    results = bisection.search(img_out)
+
+    for algo, glyphs in expected.items():
+        for glyph, targets in glyphs.items():
+            for target_density, result in targets.items():
+                found = results[algo][glyph][target_density]
+                assert found.optimal_area_left == result.optimal_area_left
+                assert found.optimal_area_right == result.optimal_area_right
+                assert found.left_density_diff == result.left_density_diff
+                assert found.right_density_diff == result.right_density_diff
@@ -0,0 +1,32 @@
+"""
+Test script for the bounded Raster2SDFGenerator
+Purpose: Check that the bounded SDF equals the full SDF clipped to max_distance
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.loader import TTF_Loader
+
+FONT = Path(__file__).parent.parent / "testing_files" / "Actor-Regular.ttf"
+GLYPHS = ["a", "O"]
+MAX_DISTANCES = [8, 40.5]
+
+
+@pytest.mark.parametrize("grayscale", [False, True])
+def test_bounded_equals_clipped(grayscale):
+    loader = TTF_Loader(glyph_set=GLYPHS, save_dir=None, grayscale=grayscale)
+    loader.load(FONT)
+    img_out = loader.process()
+
+    for glyph in GLYPHS:
+        array = img_out[glyph].array
+        full = Raster2SDFGenerator().generate(array)
+        for max_distance in MAX_DISTANCES:
+            bounded = Raster2SDFGenerator(max_distance=max_distance).generate(array)
+            clipped = np.clip(full, -max_distance, max_distance)
+            assert bounded.shape == full.shape
+            np.testing.assert_array_equal(bounded, clipped)
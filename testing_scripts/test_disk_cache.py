@@ -0,0 +1,63 @@
+"""
+Test script for DiskCache
+Purpose: Check the tracked size against the files on disk and LRU eviction down to the low-water mark
+"""
+
+import os
+
+import numpy as np
+
+from font_fitter_engine.disk_cache import DiskCache
+
+
+def entry(value, size=1000):
+    return {"array": np.full(size, value, dtype=np.float64)}
+
+
+def on_disk(cache):
+    return sum(path.stat().st_size for path in cache._entries())
+
+
+def test_size_accounting(tmp_path):
+    cache = DiskCache(tmp_path)
+    for index in range(3):
+        cache.put(DiskCache.key(index), entry(index))
+    assert cache._size == on_disk(cache) > 0
+
+    # Replacing an entry counts only its new size.
+    cache.put(DiskCache.key(0), entry(0, size=5000))
+    assert cache._size == on_disk(cache)
+
+    # A corrupt entry, counted on opening, misses and is dropped from the count.
+    cache._path(DiskCache.key(1)).write_bytes(b"not an npz")
+    cache = DiskCache(tmp_path)
+    assert cache._size == on_disk(cache)
+    assert cache.get(DiskCache.key(1)) is None
+    assert not cache._path(DiskCache.key(1)).exists()
+    assert cache._size == on_disk(cache)
+
+    np.testing.assert_array_equal(
+        cache.get(DiskCache.key(2))["array"], entry(2)["array"]
+    )
+    assert DiskCache(tmp_path)._size == cache._size
+
+
+def test_evicts_least_recently_used_to_low_water(tmp_path):
+    cache = DiskCache(tmp_path)
+    keys = [DiskCache.key(index) for index in range(10)]
+    for index, key in enumerate(keys):
+        cache.put(key, entry(index))
+        # Distinct access times, oldest first.
+        os.utime(cache._path(key), (1000 + index, 1000 + index))
+    entry_size = cache._path(keys[0]).stat().st_size
+    cache.max_bytes = 10 * entry_size
+    cache.low_water = 0.5
+    # Reading the oldest entry makes it the most recently used.
+    assert cache.get(keys[0]) is not None
+
+    new_key = DiskCache.key("new")
+    cache.put(new_key, entry(10))
+
+    kept = {key for key in [*keys, new_key] if cache._path(key).exists()}
+    assert kept == {keys[0], *keys[7:], new_key}
+    assert cache._size == on_disk(cache) <= cache.low_water * cache.max_bytes
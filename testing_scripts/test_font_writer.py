@@ -0,0 +1,151 @@
+"""
+Test script for SidebearingWriter
+Purpose: Round-trip a small TTF through the writer and check the written hmtx and glyf bounds
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.engine import SpacingEngine
+from font_fitter_engine.font_writer import SidebearingWriter
+from font_fitter_engine.loader import SPACE, TTF_Loader
+from font_fitter_engine.searcher import StepSearcher
+
+FONT = Path(__file__).parent.parent / "testing_files" / "Actor-Regular.ttf"
+
+UPEM = 2048
+SCALE = 1000
+# Ink bboxes (xMin, xMax) in font units, and (lsb, rsb) in loader pixels.
+GLYPHS = {"a": (100, 920), "b": (60, 1000), "c": (200, 600)}
+
+
+def rectangle(x_min, x_max):
+    pen = TTGlyphPen(None)
+    pen.moveTo((x_min, 0))
+    pen.lineTo((x_min, 1000))
+    pen.lineTo((x_max, 1000))
+    pen.lineTo((x_max, 0))
+    pen.closePath()
+    return pen.glyph()
+
+
+def build_font(path):
+    order = [".notdef", *GLYPHS]
+    builder = FontBuilder(UPEM, isTTF=True)
+    builder.setupGlyphOrder(order)
+    builder.setupCharacterMap({ord(glyph): glyph for glyph in GLYPHS})
+    glyphs = {".notdef": rectangle(0, 500)}
+    glyphs.update({glyph: rectangle(*bounds) for glyph, bounds in GLYPHS.items()})
+    builder.setupGlyf(glyphs)
+    builder.setupHorizontalMetrics(
+        {name: (glyphs[name].xMax + 100, glyphs[name].xMin) for name in order}
+    )
+    builder.setupHorizontalHeader(ascent=1600, descent=-400)
+    builder.setupOS2()
+    builder.setupPost()
+    builder.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    builder.save(path)
+
+
+def record(glyph, lsb_px, rsb_px, density_diff=1.0):
+    x_min, x_max = GLYPHS[glyph]
+    ink_px = round(x_max * SCALE / UPEM) - round(x_min * SCALE / UPEM)
+    return {
+        "font": "test.ttf",
+        "glyph": glyph,
+        "algo": "SDFVisualDensityAlgo",
+        "target_density": 100,
+        "lsb": 0,
+        "optimal_area_left": [SPACE - lsb_px, 0, SPACE + ink_px // 2, 1000],
+        "optimal_area_right": [SPACE + ink_px // 2, 0, SPACE + ink_px + rsb_px, 1000],
+        "left_density_diff": density_diff,
+        "right_density_diff": density_diff,
+        "left_achieved_density": 100 + density_diff,
+        "right_achieved_density": 100 + density_diff,
+    }
+
+
+def test_round_trip(tmp_path):
+    source = tmp_path / "test.ttf"
+    output = tmp_path / "out" / "test.ttf"
+    build_font(source)
+    records = [
+        record("a", 40, 60),
+        # Far from its target: left as it is.
+        record("b", 40, 60, density_diff=250.0),
+        # Left window edge inside the ink: left as it is.
+        record("c", -30, 60),
+    ]
+
+    report = SidebearingWriter(scale=SCALE).write(source, records, output)
+
+    assert report.written == ["a"]
+    assert set(report.skipped) == {"b", "c"}
+    before = TTFont(source)
+    after = TTFont(output)
+    units = UPEM / SCALE
+    x_min, x_max = GLYPHS["a"]
+    lsb, rsb = round(40 * units), round(60 * units)
+    glyph = after["glyf"]["a"]
+    glyph.recalcBounds(after["glyf"])
+    assert (glyph.xMin, glyph.xMax) == (lsb, lsb + x_max - x_min)
+    assert after["hmtx"]["a"] == (lsb + x_max - x_min + rsb, lsb)
+    for skipped in ("b", "c"):
+        assert after["hmtx"][skipped] == before["hmtx"][skipped]
+        assert list(after["glyf"][skipped].coordinates) == list(
+            before["glyf"][skipped].coordinates
+        )
+    assert after["OS/2"].xAvgCharWidth != before["OS/2"].xAvgCharWidth
+
+
+def test_round_trip_engine_output(tmp_path):
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    shutil.copy(FONT, fonts)
+    glyph_set = ["a", "c"]
+    engine = SpacingEngine(
+        loader=TTF_Loader(glyph_set=glyph_set, save_dir=None, grayscale=True),
+        searcher=StepSearcher(
+            glyph_set=glyph_set,
+            algos=[SDFVisualDensityAlgo()],
+            transform=Raster2SDFGenerator(),
+            step_size=2,
+            # Actor's glyphs reach 150, not the default 100.
+            target_densities=[100, 150],
+        ),
+    )
+    records_path = tmp_path / "records.jsonl"
+
+    reports = engine.run(
+        fonts,
+        output=str(records_path),
+        write_fonts=tmp_path / "out",
+        write_target=150,
+    )
+
+    assert sorted(reports[FONT.name].written) == glyph_set
+    records = [json.loads(line) for line in records_path.read_text().splitlines()]
+    records = [record for record in records if record.get("target_density") == 150]
+    assert sorted(record["glyph"] for record in records) == glyph_set
+    before = TTFont(FONT)
+    after = TTFont(tmp_path / "out" / FONT.name)
+    units = before["head"].unitsPerEm / 1000
+    cmap = before.getBestCmap()
+    for record in records:
+        name = cmap[ord(record["glyph"])]
+        lsb = round((SPACE - record["optimal_area_left"][0]) * units)
+        assert after["hmtx"][name][1] == lsb
+        assert after["hmtx"][name] != before["hmtx"][name]
+
+    # At 100 nothing is close enough to apply.
+    reports = engine.run(fonts, output=str(records_path), write_fonts=tmp_path / "out")
+    assert not reports[FONT.name].written
@@ -0,0 +1,78 @@
+"""
+Test script for the fit Manifest
+Purpose: Check that a second run only refits the glyph whose outline changed and replays the rest
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+from fontTools.ttLib import TTFont
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.engine import SpacingEngine
+from font_fitter_engine.loader import TTF_Loader
+from font_fitter_engine.results import _to_json
+from font_fitter_engine.searcher import StepSearcher
+
+FONT = Path(__file__).parent.parent / "testing_files" / "Actor-Regular.ttf"
+GLYPHS = ["a", "c", "o"]
+
+
+def move_point(path, glyph, dx):
+    """Moves the first point of `glyph`'s outline dx font units right."""
+    font = TTFont(path)
+    outline = font["glyf"][font.getBestCmap()[ord(glyph)]]
+    x, y = outline.coordinates[0]
+    outline.coordinates[0] = (x + dx, y)
+    font.save(path)
+
+
+def as_json(record):
+    """The record as emitted, the form the manifest replays it in."""
+    return json.loads(json.dumps(record, default=_to_json))
+
+
+def test_only_changed_glyph_is_refit(tmp_path):
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    shutil.copy(FONT, fonts)
+    engine = SpacingEngine(
+        loader=TTF_Loader(glyph_set=GLYPHS, save_dir=None, grayscale=True),
+        searcher=StepSearcher(
+            glyph_set=GLYPHS,
+            algos=[SDFVisualDensityAlgo()],
+            transform=Raster2SDFGenerator(max_distance=40),
+            step_size=2,
+            target_densities=[150],
+        ),
+        manifest_dir=tmp_path / "manifests",
+    )
+    searched = []
+    iter_search = engine.searcher.iter_search
+
+    def counting_search(img_out):
+        for glyph, glyph_results in iter_search(img_out=img_out):
+            searched.append(glyph)
+            yield glyph, glyph_results
+
+    engine.searcher.iter_search = counting_search
+
+    first = list(engine.iter_run(fonts))
+    assert sorted(searched) == GLYPHS
+
+    move_point(fonts / FONT.name, "c", 40)
+    searched.clear()
+    second = list(engine.iter_run(fonts))
+
+    assert searched == ["c"]
+    by_glyph = {record["glyph"]: as_json(record) for record in first}
+    for record in map(as_json, second):
+        if record["glyph"] == "c":
+            assert record != by_glyph["c"]
+        else:
+            assert record == by_glyph[record["glyph"]]
+    assert sorted(record["glyph"] for record in second) == GLYPHS
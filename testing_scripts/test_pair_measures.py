@@ -0,0 +1,76 @@
+"""
+Test script for the kerning pair measures
+Purpose: Check PAIR_MEASURES against the SDF algos on a composited pair, and the sign of kerns
+"""
+
+import numpy as np
+import pytest
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualAreaAlgo,
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.kerning import PAIR_MEASURES, KerningEngine, SideProfile
+
+HEIGHT = 120
+STEM = 16
+SIDEBEARING = 20
+
+
+def pair_canvas(gap, margin=30):
+    """Two stems `gap` px apart on an 8-bit canvas, ink dark on light."""
+    width = 2 * margin + 2 * STEM + gap
+    canvas = np.full((HEIGHT, width), 255, dtype=np.uint8)
+    canvas[:, margin : margin + STEM] = 0
+    canvas[:, margin + STEM + gap : margin + 2 * STEM + gap] = 0
+    return canvas, (margin + STEM, 0, margin + STEM + gap, HEIGHT)
+
+
+@pytest.mark.parametrize("algo_type", [SDFVisualAreaAlgo, SDFVisualDensityAlgo])
+@pytest.mark.parametrize("gap", [24, 40, 64])
+def test_pair_measure_matches_algo(algo_type, gap):
+    canvas, window = pair_canvas(gap)
+    sdf_array = Raster2SDFGenerator().generate(canvas)
+    calculated = algo_type().calculate(sdf_array, window)
+
+    gaps = np.full((1, HEIGHT), gap, dtype=np.float32)
+    rows = np.ones((1, HEIGHT), dtype=bool)
+    measured = PAIR_MEASURES[algo_type](gaps, rows)[0]
+    if algo_type is SDFVisualAreaAlgo:
+        # The pair measure is per shared row, the algo sums over them.
+        measured *= HEIGHT
+    # Pixel distances count from each pixel's center, a gap of g sums to
+    # about g**2 / 4 + g / 2 rather than g**2 / 4.
+    assert calculated == pytest.approx(measured, rel=3 / gap)
+
+
+def glyph(boxes, width=80):
+    """A glyph mask from (top, bottom, left, right) ink boxes, end exclusive."""
+    ink = np.zeros((HEIGHT, width), dtype=bool)
+    for top, bottom, left, right in boxes:
+        ink[top:bottom, left:right] = True
+    return ink
+
+
+@pytest.mark.parametrize("algo_type", [SDFVisualAreaAlgo, SDFVisualDensityAlgo])
+def test_kern_sign(algo_type):
+    masks = {
+        # Flat sides: the reference pair.
+        "H": glyph([(0, HEIGHT, 0, STEM), (0, HEIGHT, 80 - STEM, 80)]),
+        # L's right side and T's left side are mostly open.
+        "L": glyph([(0, HEIGHT, 0, STEM), (HEIGHT - STEM, HEIGHT, 0, 80)]),
+        "T": glyph([(0, STEM, 0, 80), (0, HEIGHT, 40 - STEM // 2, 40 + STEM // 2)]),
+        # Flat sides like H, with far smaller sidebearings.
+        "I": glyph([(0, HEIGHT, 0, STEM)], width=STEM),
+    }
+    profiles = {name: SideProfile.from_ink(ink) for name, ink in masks.items()}
+    sidebearings = {name: (SIDEBEARING, SIDEBEARING) for name in masks}
+    sidebearings["I"] = (2, 2)
+
+    kerner = KerningEngine(algo_type(), reference="H", min_kern=1, row_step=1)
+    table = kerner.kerning_table(profiles, sidebearings)
+
+    assert ("H", "H") not in table
+    assert table[("L", "T")] < 0
+    assert table[("I", "I")] > 0
@@ -0,0 +1,78 @@
+"""
+Test script for FittingServer
+Purpose: Check that requests merged into one batch succeed or fail on their own glyphs
+"""
+
+import asyncio
+from pathlib import Path
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.engine import SpacingEngine
+from font_fitter_engine.loader import TTF_Loader
+from font_fitter_engine.searcher import StepSearcher
+from font_fitter_engine.server import FittingServer
+
+FONT = Path(__file__).parent.parent / "testing_files" / "Actor-Regular.ttf"
+
+
+def make_server():
+    glyph_set = ["a"]
+    engine = SpacingEngine(
+        loader=TTF_Loader(glyph_set=glyph_set, save_dir=None, grayscale=True),
+        searcher=StepSearcher(
+            glyph_set=glyph_set,
+            algos=[SDFVisualDensityAlgo()],
+            transform=Raster2SDFGenerator(max_distance=40),
+            target_densities=[100],
+        ),
+    )
+    # Long enough for both requests to join one batch.
+    return FittingServer(engine, batch_delay=0.2)
+
+
+def test_missing_glyph_fails_only_its_request():
+    server = make_server()
+
+    async def fit_both():
+        return await asyncio.gather(
+            server.fit("run", FONT, ["a"]),
+            server.fit("run", FONT, ["☃"]),
+            return_exceptions=True,
+        )
+
+    try:
+        valid, missing = asyncio.run(fit_both())
+    finally:
+        server.close()
+
+    assert [record["glyph"] for record in valid] == ["a"]
+    assert isinstance(missing, KeyError)
+
+
+def test_merged_requests_share_one_job():
+    server = make_server()
+    calls = []
+    job = server._job()
+
+    def counting_job(style, path, glyphs, location):
+        calls.append(glyphs)
+        return job(style, path, glyphs, location)
+
+    server._job = lambda: counting_job
+
+    async def fit_both():
+        return await asyncio.gather(
+            server.fit("run", FONT, ["a"]), server.fit("run", FONT, ["H"])
+        )
+
+    try:
+        first, second = asyncio.run(fit_both())
+    finally:
+        server.close()
+
+    assert calls == [["a", "H"]]
+    assert [record["glyph"] for record in first] == ["a"]
+    assert [record["glyph"] for record in second] == ["H"]
@@ -0,0 +1,79 @@
+"""
+Test script for the SummedAreaTable lookups of the algos
+Purpose: Check that calculate_many on a prepared table equals calculate and a numpy slice per window
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from font_fitter_engine.algo_gaussian_blur.gaussain_blur import PER_MILLE, BlurAlgo
+from font_fitter_engine.algo_gaussian_blur.raster_2_blur_generator import (
+    Raster2BlurGenerator,
+)
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualAreaAlgo,
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.loader import TTF_Loader
+
+FONT = Path(__file__).parent.parent / "testing_files" / "Actor-Regular.ttf"
+
+
+def sliced(algo, array, area):
+    """The window's score straight from a numpy slice, without a table."""
+    x1, y1, x2, y2 = area
+    zone = array[y1:y2, x1:x2]
+    if isinstance(algo, SDFVisualAreaAlgo):
+        return np.sum(zone, dtype=np.float64)
+    if isinstance(algo, SDFVisualDensityAlgo):
+        return np.sum(zone, dtype=np.float64) // zone.size
+    return PER_MILLE * np.sum(zone, dtype=np.float64) / zone.size
+
+
+def windows(array, count=100, step_size=9, seed=0):
+    """Sweep windows either side of the center, as the searchers score,
+    and random ones, some of them reaching past the canvas."""
+    height, width = array.shape[:2]
+    center_x = width // 2
+    steps = range(1, center_x, step_size)
+    areas = [(center_x - step, 0, center_x, height) for step in steps]
+    areas += [(center_x, 0, center_x + step, height) for step in steps]
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        x1, y1 = rng.integers(width), rng.integers(height)
+        areas.append(
+            (
+                x1,
+                y1,
+                rng.integers(x1 + 1, width + 10),
+                rng.integers(y1 + 1, height + 10),
+            )
+        )
+    return np.array(areas)
+
+
+@pytest.mark.parametrize(
+    "algo, transform",
+    [
+        (SDFVisualDensityAlgo(), Raster2SDFGenerator(max_distance=40)),
+        (SDFVisualAreaAlgo(), Raster2SDFGenerator(max_distance=40)),
+        (BlurAlgo(), Raster2BlurGenerator()),
+    ],
+)
+def test_calculate_many_matches_calculate(algo, transform):
+    loader = TTF_Loader(glyph_set=["a"], save_dir=None, grayscale=True)
+    loader.load(FONT)
+    array = transform.generate(loader.process()["a"].array)
+    areas = windows(array)
+
+    table = algo.prepare(array)
+    many = algo.calculate_many(table, areas)
+
+    one_by_one = [algo.calculate(table, tuple(area)) for area in areas.tolist()]
+    np.testing.assert_array_equal(many, one_by_one)
+    expected = [sliced(algo, array, area) for area in areas.tolist()]
+    # Table differences round differently from a direct sum.
+    np.testing.assert_allclose(many, expected, rtol=1e-9, atol=1)
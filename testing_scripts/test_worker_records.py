@@ -0,0 +1,45 @@
+"""
+Test script for SpacingEngine workers
+Purpose: Check that records streamed back from worker processes match a serial run
+"""
+
+import shutil
+import string
+from pathlib import Path
+
+from font_fitter_engine.algo_sdf.raster_2_sfd_generator import Raster2SDFGenerator
+from font_fitter_engine.algo_sdf.sdf_visual_density_calculator import (
+    SDFVisualDensityAlgo,
+)
+from font_fitter_engine.engine import RECORD_BATCH, SpacingEngine
+from font_fitter_engine.loader import TTF_Loader
+from font_fitter_engine.searcher import StepSearcher
+
+FONT = Path(__file__).parent.parent / "testing_files" / "Actor-Regular.ttf"
+# More records than fit in one batch.
+GLYPHS = list(string.ascii_lowercase + "ABCDEFG")
+TARGETS = [100, 150]
+
+
+def test_workers_match_serial(tmp_path):
+    shutil.copy(FONT, tmp_path)
+    (tmp_path / "broken.ttf").write_bytes(b"not a font")
+    engine = SpacingEngine(
+        loader=TTF_Loader(glyph_set=GLYPHS, save_dir=None, grayscale=True),
+        searcher=StepSearcher(
+            glyph_set=GLYPHS,
+            algos=[SDFVisualDensityAlgo()],
+            transform=Raster2SDFGenerator(max_distance=40),
+            step_size=2,
+            target_densities=TARGETS,
+        ),
+    )
+    assert len(GLYPHS) * len(TARGETS) > RECORD_BATCH
+
+    serial = list(engine.iter_run(tmp_path))
+    ordered = list(engine.iter_run(tmp_path, workers=2))
+    completed = list(engine.iter_run(tmp_path, workers=2, ordered=False))
+
+    assert ordered == serial
+    assert sorted(completed, key=repr) == sorted(serial, key=repr)
+    assert [record["font"] for record in serial if "error" in record] == ["broken.ttf"]